@@ -1,7 +1,14 @@
 # Agent module - imports are deferred to avoid import errors when livekit-agents is not installed
-from .prompts import SYSTEM_PROMPT, get_user_context_prompt
+from .prompts import (
+    SYSTEM_PROMPT,
+    build_system_messages,
+    get_user_context_prompt,
+    to_openai_string,
+)
 
 __all__ = [
     "SYSTEM_PROMPT",
+    "build_system_messages",
     "get_user_context_prompt",
+    "to_openai_string",
 ]
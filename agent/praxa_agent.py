@@ -63,6 +63,7 @@ from services.memory_service import extract_and_store_session_memory, load_sessi
 from services.skill_service import extract_skills_from_session
 from agent.prompts import (
     SYSTEM_PROMPT, IN_APP_SYSTEM_PROMPT,
+    build_system_messages, to_openai_string,
     get_user_context_prompt, get_opening_message, get_in_app_opening_message, get_closing_message,
 )
 
@@ -302,7 +303,9 @@ class PraxaAgent:
                 skills_lines.append(f"\n### {skill['name']}{category_tag}\n{skill['content']}")
             skills_section = "".join(skills_lines)
 
-        return f"{base_prompt}\n\n--- USER CONTEXT ---\n{context_prompt}{memory_section}{skills_section}"
+        return to_openai_string(
+            build_system_messages(f"{context_prompt}{memory_section}{skills_section}", base_prompt)
+        )
 
     def _get_opening_message(self) -> str:
         """Get the opening message."""
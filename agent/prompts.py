@@ -1,5 +1,9 @@
 """System prompts for Praxa's voice AI personality."""
 
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+
 _LISTENING_SECTION = """
 ## LISTENING-FIRST PRINCIPLES
 
@@ -208,6 +212,125 @@ REMEMBER: Be proactive. Don't wait for explicit commands.
 If context suggests an action, TAKE IT and briefly confirm."""
 
 
+def _normalize_prompt(prompt: str) -> str:
+    """Strip trailing spaces, collapse interior space runs and extra blank lines.
+
+    Leading indentation is kept since it marks nested list items.
+    """
+    prompt = re.sub(r"[ \t]+\n", "\n", prompt.strip())
+    prompt = re.sub(r"(?<=\S)  +", " ", prompt)
+    return re.sub(r"\n{3,}", "\n\n", prompt)
+
+
+# Normalized once at import so every request sends the same, minimal prefix.
+SYSTEM_PROMPT = _normalize_prompt(SYSTEM_PROMPT)
+IN_APP_SYSTEM_PROMPT = _normalize_prompt(IN_APP_SYSTEM_PROMPT)
+
+USER_CONTEXT_SEPARATOR = "\n\n--- USER CONTEXT ---\n"
+
+# Check-in frequency wording for the user context and the closing message
+_CONTEXT_FREQUENCY_TEXT = {
+    "once_per_week": "once per week",
+    "twice_per_week": "twice per week",
+    "off": "calls are disabled",
+}
+_CLOSING_NEXT_CALL_TEXT = {
+    "once_per_week": "next week",
+    "twice_per_week": "in a few days",
+}
+
+
+def build_system_messages(
+    user_context: str,
+    base_prompt: str = SYSTEM_PROMPT,
+) -> tuple[str, str]:
+    """
+    Split the system prompt into a static prefix and the per-user context.
+
+    The static part is identical across calls, so providers with prompt
+    caching can reuse it; the user context changes every call.
+
+    Args:
+        user_context: Output of get_user_context_prompt plus any extra sections
+        base_prompt: SYSTEM_PROMPT or IN_APP_SYSTEM_PROMPT
+
+    Returns:
+        A (static_prompt, user_context) tuple
+    """
+    return (base_prompt, user_context)
+
+
+def to_openai_string(messages: tuple[str, str]) -> str:
+    """Join system messages into the single string OpenAI-style APIs expect."""
+    static_prompt, user_context = messages
+    return f"{static_prompt}{USER_CONTEXT_SEPARATOR}{user_context}"
+
+
+# Opening lines keyed by (has recently completed tasks, has tasks this week)
+_OPENING_RECENT_WINS = (
+    "Hi{name_part}! This is Praxa, your productivity assistant. "
+    "I see you've completed {recently_completed_count} tasks recently — that's awesome! "
+    "You have {this_week_count} tasks on your plate for this week.{calendar_snippet} "
+    "How are things going?"
+)
+_OPENING_TEMPLATES = {
+    (True, True): _OPENING_RECENT_WINS,
+    (True, False): _OPENING_RECENT_WINS,
+    (False, True): (
+        "Hi{name_part}! This is Praxa, your productivity assistant. "
+        "I'm calling to check in on your week. "
+        "You have {this_week_count} tasks planned.{calendar_snippet} "
+        "How's it all going?"
+    ),
+    (False, False): (
+        "Hi{name_part}! This is Praxa, your productivity assistant. "
+        "I'm calling to check in and see how things are going.{calendar_snippet} "
+        "Do you have any tasks or goals you'd like to discuss?"
+    ),
+}
+
+# Closing lines keyed by (completed any tasks, created any tasks)
+_CLOSING_TEMPLATES = {
+    (True, True): (
+        "Great check-in! We marked {tasks_completed} tasks as done "
+        "and added {tasks_created} new ones to your list. "
+        "Keep up the momentum! I'll talk to you {next_call}. Take care!"
+    ),
+    (True, False): (
+        "Nice work! We marked {tasks_completed} tasks as complete. "
+        "You're making great progress. Talk to you {next_call}. Bye!"
+    ),
+    (False, True): (
+        "Good chat! I've added {tasks_created} new tasks to your list. "
+        "I'll check back in {next_call}. Have a great day!"
+    ),
+    (False, False): (
+        "Thanks for the update! "
+        "I'll check in again {next_call}. Keep going, you've got this!"
+    ),
+}
+
+
+def _count_events_by_day(calendar_events: list[dict]) -> dict[str, int]:
+    """Count calendar events per weekday name over the next 7 days."""
+    today = datetime.now().date()
+    week_end = today + timedelta(days=7)
+    week_days: dict[str, int] = {}
+    for event in calendar_events:
+        when = event.get("when", {})
+        start_time_str = when.get("start_time") or when.get("date")
+        if not start_time_str:
+            continue
+        try:
+            event_date = datetime.fromisoformat(start_time_str.replace("Z", "+00:00")).date()
+        except Exception:
+            continue
+        if today <= event_date <= week_end:
+            day_name = event_date.strftime("%A")
+            week_days[day_name] = week_days.get(day_name, 0) + 1
+    return week_days
+
+
 def get_user_context_prompt(
     user_name: str | None,
     buckets: list[dict],
@@ -236,127 +359,100 @@ def get_user_context_prompt(
     Returns:
         A formatted string with user context
     """
-    context_parts = []
+    # One flat list of lines joined once at the end; "" entries are the blank
+    # lines between sections
+    lines: list[str] = []
     
     # User greeting context
     if user_name:
-        context_parts.append(f"The user's name is {user_name}.")
+        lines.extend((f"The user's name is {user_name}.", ""))
     
     # Buckets/initiatives
     if buckets:
-        bucket_list = []
+        lines.append("Their current initiatives/buckets:")
         for bucket in buckets:
             goal_info = f" (Goal: {bucket['goal']})" if bucket.get('goal') else ""
             task_count = len(bucket.get('loops', []))
-            bucket_list.append(f"- {bucket['name']}{goal_info}: {task_count} tasks")
-        
-        context_parts.append(
-            "Their current initiatives/buckets:\n" + "\n".join(bucket_list)
-        )
+            lines.append(f"- {bucket['name']}{goal_info}: {task_count} tasks")
+        lines.append("")
     
     # This week's tasks
     if this_week_tasks:
         bucket_goal_map = {b['name']: b.get('goal') for b in buckets if b.get('goal')}
         task_list = []
-        for task in this_week_tasks:
-            priority = f" [{task['priority']}]" if task.get('priority') != 'medium' else ""
-            bucket_name = task.get('bucket_name', '')
-            bucket_note = f" ({bucket_name})" if bucket_name else ""
+        for task in this_week_tasks[:10]:
+            get = task.get
+            bucket_name = get('bucket_name', '')
             goal_text = bucket_goal_map.get(bucket_name)
-            goal_note = f" [toward: {goal_text}]" if goal_text else ""
-            status = f" - {task['status']}" if task.get('status') != 'open' else ""
-            task_list.append(f"- {task['title']}{priority}{bucket_note}{goal_note}{status}")
+            # Adjacent f-strings compile to a single string build
+            task_list.append(
+                f"- {task['title']}"
+                f"{f' [{priority}]' if (priority := get('priority')) != 'medium' else ''}"
+                f"{f' ({bucket_name})' if bucket_name else ''}"
+                f"{f' [toward: {goal_text}]' if goal_text else ''}"
+                f"{f' - {status}' if (status := get('status')) != 'open' else ''}"
+            )
         
-        context_parts.append(
-            f"Tasks marked for THIS WEEK ({len(this_week_tasks)} total):\n" + "\n".join(task_list[:10])
-        )
-        if len(this_week_tasks) > 10:
-            context_parts.append(f"... and {len(this_week_tasks) - 10} more tasks")
+        lines.append(f"Tasks marked for THIS WEEK ({len(this_week_tasks)} total):")
+        lines.extend(task_list)
+        lines.append("")
+        extra = len(this_week_tasks) - 10
+        if extra > 0:
+            lines.extend((f"... and {extra} more tasks", ""))
     else:
-        context_parts.append("They have no tasks marked for this week.")
+        lines.extend(("They have no tasks marked for this week.", ""))
     
     # Backlog count
     if backlog_count > 0:
-        context_parts.append(
+        lines.extend((
             f"Backlog: {backlog_count} tasks waiting (not scheduled for this week). "
-            "Use get_backlog_tasks() during the backlog review step to get the full list."
-        )
+            "Use get_backlog_tasks() during the backlog review step to get the full list.",
+            "",
+        ))
 
     # Overdue tasks
     if overdue_tasks:
-        overdue_list = []
+        lines.append(f"OVERDUE tasks ({len(overdue_tasks)} total) - mention these gently:")
         for task in overdue_tasks[:5]:
-            bucket_name = f" ({task.get('bucket_name', 'Unknown')})" if task.get('bucket_name') else ""
-            overdue_list.append(f"- {task['title']}{bucket_name}")
-        
-        context_parts.append(
-            f"OVERDUE tasks ({len(overdue_tasks)} total) - mention these gently:\n" + "\n".join(overdue_list)
-        )
+            lines.append(f"- {task['title']}{f' ({bucket_name})' if (bucket_name := task.get('bucket_name')) else ''}")
+        lines.append("")
     
     # Recently completed (for celebration)
     if recently_completed:
-        completed_list = [f"- {task['title']}" for task in recently_completed[:5]]
-        context_parts.append(
-            f"Recently completed ({len(recently_completed)} in past week) - celebrate these!:\n" + "\n".join(completed_list)
-        )
+        lines.append(f"Recently completed ({len(recently_completed)} in past week) - celebrate these!:")
+        lines.extend(f"- {task['title']}" for task in recently_completed[:5])
+        lines.append("")
     
     # Calendar context (if available)
     if calendar_events is not None and calendar_busy_count > 0:
-        from datetime import datetime, timedelta
-        
-        # Group events by day for summary
-        today = datetime.now().date()
-        week_days = {}
-        
-        for event in calendar_events:
-            when = event.get("when", {})
-            start_time_str = when.get("start_time") or when.get("date")
-            
-            if not start_time_str:
-                continue
-            
-            try:
-                event_date = datetime.fromisoformat(start_time_str.replace('Z', '+00:00')).date()
-                if event_date < today or event_date > today + timedelta(days=7):
-                    continue
-                
-                day_name = event_date.strftime("%A")
-                if day_name not in week_days:
-                    week_days[day_name] = 0
-                week_days[day_name] += 1
-            except:
-                continue
-        
+        week_days = _count_events_by_day(calendar_events)
+
         if week_days:
             busiest_day = max(week_days.items(), key=lambda x: x[1])
             lightest_days = [day for day, count in week_days.items() if count <= 2]
             
-            calendar_summary = f"CALENDAR: {calendar_busy_count} events this week. "
+            calendar_parts = [f"CALENDAR: {calendar_busy_count} events this week."]
             if busiest_day[1] > 3:
-                calendar_summary += f"{busiest_day[0]} is busiest with {busiest_day[1]} meetings. "
+                calendar_parts.append(f"{busiest_day[0]} is busiest with {busiest_day[1]} meetings.")
             if lightest_days:
-                calendar_summary += f"{lightest_days[0]} looks lighter - good for focused work. "
-            
-            calendar_summary += "\nUse get_calendar_overview() or get_todays_calendar() tools to discuss their calendar when relevant."
-            context_parts.append(calendar_summary)
+                calendar_parts.append(f"{lightest_days[0]} looks lighter - good for focused work.")
+
+            calendar_parts.append("\nUse get_calendar_overview() or get_todays_calendar() tools to discuss their calendar when relevant.")
+            lines.extend((" ".join(calendar_parts), ""))
     
     # Email context (if available)
     if email_summary:
-        context_parts.append(
-            f"EMAIL CONTEXT (pre-loaded — use check_email() tool to share this with user):\n{email_summary}"
-        )
+        lines.extend((
+            f"EMAIL CONTEXT (pre-loaded — use check_email() tool to share this with user):\n{email_summary}",
+            "",
+        ))
 
     # Frequency info
-    freq_map = {
-        "once_per_week": "once per week",
-        "twice_per_week": "twice per week",
-        "off": "calls are disabled"
-    }
-    context_parts.append(
-        f"Check-in frequency: {freq_map.get(checkin_frequency, checkin_frequency)}"
+    lines.append(
+        f"Check-in frequency: {_CONTEXT_FREQUENCY_TEXT.get(checkin_frequency, checkin_frequency)}"
     )
     
-    return "\n\n".join(context_parts)
+    return "\n".join(lines)
 
 
 def get_opening_message(
@@ -371,22 +467,7 @@ def get_opening_message(
     # Build a brief calendar snippet for the opening
     calendar_snippet = ""
     if calendar_events:
-        from datetime import datetime, timedelta
-        today = datetime.now().date()
-        week_days: dict = {}
-        for event in calendar_events:
-            when = event.get("when", {})
-            start_time_str = when.get("start_time") or when.get("date")
-            if not start_time_str:
-                continue
-            try:
-                event_date = datetime.fromisoformat(start_time_str.replace("Z", "+00:00")).date()
-                if today <= event_date <= today + timedelta(days=7):
-                    day_name = event_date.strftime("%A")
-                    week_days[day_name] = week_days.get(day_name, 0) + 1
-            except Exception:
-                continue
-        
+        week_days = _count_events_by_day(calendar_events)
         if week_days:
             total = sum(week_days.values())
             busiest = max(week_days.items(), key=lambda x: x[1])
@@ -395,26 +476,13 @@ def get_opening_message(
             elif total > 0:
                 calendar_snippet = f" You've got {total} calendar events this week."
     
-    if recently_completed_count > 0:
-        return (
-            f"Hi{name_part}! This is Praxa, your productivity assistant. "
-            f"I see you've completed {recently_completed_count} tasks recently — that's awesome! "
-            f"You have {this_week_count} tasks on your plate for this week.{calendar_snippet} "
-            "How are things going?"
-        )
-    elif this_week_count > 0:
-        return (
-            f"Hi{name_part}! This is Praxa, your productivity assistant. "
-            f"I'm calling to check in on your week. "
-            f"You have {this_week_count} tasks planned.{calendar_snippet} "
-            "How's it all going?"
-        )
-    else:
-        return (
-            f"Hi{name_part}! This is Praxa, your productivity assistant. "
-            f"I'm calling to check in and see how things are going.{calendar_snippet} "
-            "Do you have any tasks or goals you'd like to discuss?"
-        )
+    template = _OPENING_TEMPLATES[(recently_completed_count > 0, this_week_count > 0)]
+    return template.format(
+        name_part=name_part,
+        recently_completed_count=recently_completed_count,
+        this_week_count=this_week_count,
+        calendar_snippet=calendar_snippet,
+    )
 
 
 def get_in_app_opening_message(
@@ -442,6 +510,7 @@ def get_in_app_opening_message(
         )
 
 
+@lru_cache(maxsize=256)
 def get_closing_message(
     tasks_completed: int,
     tasks_created: int,
@@ -458,31 +527,11 @@ def get_closing_message(
     Returns:
         The closing message string
     """
-    freq_map = {
-        "once_per_week": "next week",
-        "twice_per_week": "in a few days",
-    }
-    next_call = freq_map.get(next_call_frequency, "next time")
-    
-    if tasks_completed > 0 and tasks_created > 0:
-        return (
-            f"Great check-in! We marked {tasks_completed} tasks as done "
-            f"and added {tasks_created} new ones to your list. "
-            f"Keep up the momentum! I'll talk to you {next_call}. Take care!"
-        )
-    elif tasks_completed > 0:
-        return (
-            f"Nice work! We marked {tasks_completed} tasks as complete. "
-            f"You're making great progress. Talk to you {next_call}. Bye!"
-        )
-    elif tasks_created > 0:
-        return (
-            f"Good chat! I've added {tasks_created} new tasks to your list. "
-            f"I'll check back in {next_call}. Have a great day!"
-        )
-    else:
-        return (
-            f"Thanks for the update! "
-            f"I'll check in again {next_call}. Keep going, you've got this!"
-        )
+    next_call = _CLOSING_NEXT_CALL_TEXT.get(next_call_frequency, "next time")
+    template = _CLOSING_TEMPLATES[(tasks_completed > 0, tasks_created > 0)]
+    return template.format(
+        tasks_completed=tasks_completed,
+        tasks_created=tasks_created,
+        next_call=next_call,
+    )
 
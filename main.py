@@ -8,21 +8,32 @@ and manages the background scheduler for automated calls.
 
 import os
 import asyncio
+import base64
+import hashlib
+import hmac
 import json
 import logging
-from datetime import datetime, timezone
+import re
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
 from contextlib import asynccontextmanager
 from typing import Optional
+from urllib.parse import parse_qsl
 from uuid import UUID, uuid4
+from zoneinfo import ZoneInfo
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Form, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import ORJSONResponse, Response
+import orjson
 from dotenv import load_dotenv
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
+import aiohttp
+import jwt
 from livekit import api as livekit_api
 
 from models.schemas import (
@@ -33,8 +44,13 @@ from models.schemas import (
     CallStatus,
 )
 from services.supabase_client import get_supabase_client, SupabaseClient
-from services.scheduler import get_call_scheduler, CallScheduler
-from services.push_service import send_push_notification, get_user_push_token, schedule_receipt_check
+from services.scheduler import get_call_scheduler, CallScheduler, ScheduledCallLogFilter
+from services.push_service import (
+    send_push_notification,
+    get_user_push_token,
+    schedule_receipt_check,
+    close_http_client,
+)
 
 # Load environment variables
 load_dotenv()
@@ -42,8 +58,10 @@ load_dotenv()
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    format="%(asctime)s - %(name)s - %(levelname)s%(scheduled_call)s - %(message)s"
 )
+for _handler in logging.getLogger().handlers:
+    _handler.addFilter(ScheduledCallLogFilter())
 logger = logging.getLogger(__name__)
 
 # Reduce noise from third-party libraries
@@ -64,33 +82,135 @@ LIVEKIT_API_SECRET = os.getenv("LIVEKIT_API_SECRET")
 # Supabase configuration for JWT validation
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
+# Legacy HS256 signing secret (Project Settings -> API -> JWT Secret). Optional:
+# asymmetric signing keys are checked against the project's JWKS instead.
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
 
 # Shared secret for internal service-to-service calls (background agent → trigger call)
 PRAXA_INTERNAL_SECRET = os.getenv("PRAXA_INTERNAL_SECRET", "")
 
 
-async def verify_jwt_token(request: Request) -> dict:
+# Shared LiveKit API client, created on first use and closed on shutdown
+_livekit_api: Optional[livekit_api.LiveKitAPI] = None
+
+
+def get_livekit_api() -> livekit_api.LiveKitAPI:
+    """Get or create the shared LiveKit API client."""
+    global _livekit_api
+    if _livekit_api is None:
+        _livekit_api = livekit_api.LiveKitAPI(
+            LIVEKIT_URL,
+            LIVEKIT_API_KEY,
+            LIVEKIT_API_SECRET
+        )
+    return _livekit_api
+
+
+async def close_livekit_api() -> None:
+    """Close the shared LiveKit API client if it was created."""
+    global _livekit_api
+    if _livekit_api is not None:
+        await _livekit_api.aclose()
+        _livekit_api = None
+
+
+# Verified JWTs keyed by SHA-256 of the token: {key: (expires_at_monotonic, auth)}.
+# Only successful verifications are cached, and never past the token's own exp.
+# Kept in least-recently-used order so active sessions survive eviction.
+JWT_CACHE_TTL_SECONDS = 60
+JWT_CACHE_MAX_SIZE = 10_000
+_jwt_cache: dict[str, tuple[float, dict]] = {}
+_jwt_inflight: dict[str, asyncio.Task] = {}
+
+
+def _is_well_formed_jwt(token: str) -> bool:
+    """Cheap structural check: three base64url segments with a JSON header."""
+    if token.count(".") != 2:
+        return False
+    header_segment = token.split(".", 1)[0]
+    try:
+        header = orjson.loads(base64.urlsafe_b64decode(header_segment + "=" * (-len(header_segment) % 4)))
+    except Exception:
+        return False
+    return isinstance(header, dict)
+
+
+def _jwt_cache_ttl(token: str) -> float:
+    """Seconds a verified token may stay cached: the default TTL capped at its exp claim."""
+    try:
+        payload_segment = token.split(".")[1]
+        payload = orjson.loads(base64.urlsafe_b64decode(payload_segment + "=" * (-len(payload_segment) % 4)))
+        exp = float(payload["exp"])
+    except Exception:
+        return JWT_CACHE_TTL_SECONDS
+    return min(JWT_CACHE_TTL_SECONDS, exp - time.time())
+
+
+def _cache_verified_jwt(key: str, token: str, auth: dict) -> None:
+    """Store a verified token, evicting the least recently used entries when the cache is full."""
+    ttl = _jwt_cache_ttl(token)
+    if ttl <= 0:
+        return
+    while len(_jwt_cache) >= JWT_CACHE_MAX_SIZE:
+        _jwt_cache.pop(next(iter(_jwt_cache)))
+    _jwt_cache[key] = (time.monotonic() + ttl, auth)
+
+
+# JWKS client for asymmetric Supabase signing keys, created on first use.
+# PyJWKClient caches the fetched key set, so the endpoint is hit rarely.
+_jwks_client: Optional[jwt.PyJWKClient] = None
+
+
+def get_jwks_client() -> jwt.PyJWKClient:
+    """Get or create the shared JWKS client for the Supabase project."""
+    global _jwks_client
+    if _jwks_client is None:
+        _jwks_client = jwt.PyJWKClient(f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json")
+    return _jwks_client
+
+
+async def _verify_jwt_locally(token: str) -> Optional[dict]:
     """
-    Verify Supabase JWT token using Supabase client.
-    
-    This properly verifies the JWT signature using Supabase's auth system.
-    
-    Args:
-        request: FastAPI Request object
-        
-    Returns:
-        Dict with 'user_id' if token is valid
-        
+    Verify a token's signature in-process.
+
+    Returns the auth dict on success, or None when the token can't be checked
+    locally (unknown algorithm, no secret configured, key lookup failed) so the
+    caller can fall back to Supabase.
+
     Raises:
-        HTTPException with 401 status if token is invalid or missing
+        HTTPException with 401 status if the token has expired
     """
-    auth_header = request.headers.get("Authorization")
-    
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
-    
-    token = auth_header.split(" ")[1]
-    
+    try:
+        alg = jwt.get_unverified_header(token).get("alg")
+        if alg == "HS256":
+            if not SUPABASE_JWT_SECRET:
+                return None
+            signing_key = SUPABASE_JWT_SECRET
+        elif alg in ("RS256", "ES256"):
+            # Blocking only when the key set isn't cached yet
+            signing_key = (await asyncio.to_thread(get_jwks_client().get_signing_key_from_jwt, token)).key
+        else:
+            return None
+        payload = jwt.decode(token, signing_key, algorithms=[alg], audience="authenticated")
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Token expired")
+    except (jwt.InvalidTokenError, jwt.PyJWKClientError) as e:
+        logger.debug(f"Local JWT verification failed, falling back to Supabase: {e}")
+        return None
+    return {"user_id": payload["sub"]}
+
+
+async def _verify_jwt(key: str, token: str) -> dict:
+    """Verify a token locally if possible, otherwise against Supabase, and cache the result."""
+    auth = await _verify_jwt_locally(token)
+    if auth is None:
+        auth = await _verify_jwt_with_supabase(token)
+    _cache_verified_jwt(key, token, auth)
+    return auth
+
+
+async def _verify_jwt_with_supabase(token: str) -> dict:
+    """Verify a token against Supabase auth."""
     try:
         # Use Supabase client to verify the token properly
         supabase_client = get_supabase_client()
@@ -108,12 +228,229 @@ async def verify_jwt_token(request: Request) -> dict:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
 
-async def trigger_call_for_user(user_id: str, reason: Optional[str] = None) -> Optional[dict]:
+class _PrebuiltUnauthorized(Exception):
+    """401 whose JSON body is serialized once at import; see _unauthorized_handler."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+
+# Pre-serialized bodies for the cheap rejections that need no verification work
+_MISSING_AUTH_HEADER_BODY = b'{"detail":"Missing or invalid Authorization header"}'
+_MALFORMED_TOKEN_BODY = b'{"detail":"Invalid token"}'
+
+
+async def _unauthorized_handler(request: Request, exc: _PrebuiltUnauthorized) -> Response:
+    return Response(content=exc.body, status_code=401, media_type="application/json")
+
+
+def _get_authorization_header(scope: dict) -> Optional[str]:
+    """Return the Authorization header straight from the ASGI scope, if present."""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return value.decode("latin-1")
+    return None
+
+
+async def verify_jwt_token(request: Request) -> dict:
+    """
+    Verify Supabase JWT token.
+    
+    The signature is checked in-process against SUPABASE_JWT_SECRET or the
+    project's JWKS, falling back to Supabase's auth system when that isn't
+    possible. Successful verifications are cached briefly so repeat requests with the
+    same token skip the Supabase round-trip, and concurrent requests with an
+    uncached token share a single verification.
+    
+    Args:
+        request: FastAPI Request object
+        
+    Returns:
+        Dict with 'user_id' if token is valid
+        
+    Raises:
+        HTTPException with 401 status if token is invalid or missing
+    """
+    # Read the raw ASGI header list rather than building request.headers
+    auth_header = _get_authorization_header(request.scope)
+    
+    if not auth_header or not auth_header.startswith("Bearer "):
+        raise _PrebuiltUnauthorized(_MISSING_AUTH_HEADER_BODY)
+    
+    token = auth_header.split(" ")[1]
+
+    # Reject obvious garbage before spending a Supabase round-trip on it
+    if not _is_well_formed_jwt(token):
+        raise _PrebuiltUnauthorized(_MALFORMED_TOKEN_BODY)
+
+    key = hashlib.sha256(token.encode()).hexdigest()
+
+    cached = _jwt_cache.pop(key, None)
+    if cached and cached[0] > time.monotonic():
+        _jwt_cache[key] = cached  # Re-insert to mark as most recently used
+        return cached[1]
+
+    task = _jwt_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_verify_jwt(key, token))
+        _jwt_inflight[key] = task
+        task.add_done_callback(lambda _: _jwt_inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+# User settings for the /trigger-call early rejections only:
+# {user_id: (expires_at_monotonic, user_data)}. Kept short since the app edits
+# settings directly in Supabase; misses are not cached. Never dial from these:
+# the call trigger refetches fresh settings.
+SETTINGS_CACHE_TTL_SECONDS = 30
+SETTINGS_CACHE_MAX_SIZE = 5_000
+_settings_cache: dict[str, tuple[float, dict]] = {}
+
+
+async def get_user_with_settings_cached(db: SupabaseClient, user_id: str) -> Optional[dict]:
+    """get_user_with_settings behind a short in-process TTL cache."""
+    cached = _settings_cache.get(user_id)
+    if cached:
+        if cached[0] > time.monotonic():
+            return cached[1]
+        _settings_cache.pop(user_id, None)
+
+    user_data = await db.get_user_with_settings(user_id)
+    if user_data:
+        while len(_settings_cache) >= SETTINGS_CACHE_MAX_SIZE:
+            _settings_cache.pop(next(iter(_settings_cache)))
+        _settings_cache[user_id] = (time.monotonic() + SETTINGS_CACHE_TTL_SECONDS, user_data)
+    return user_data
+
+
+def invalidate_user_settings_cache(user_id: str) -> None:
+    """Drop a user's cached settings after this service writes to them."""
+    _settings_cache.pop(user_id, None)
+
+
+# /call-logs rows: {user_id: (expires_at_monotonic, fetched_limit, call_logs)}.
+# One entry per user; smaller limits are served by slicing. Dropped whenever
+# this service writes a user's call log; the short TTL bounds staleness from
+# writes made elsewhere (the agent saving transcripts).
+CALL_LOGS_CACHE_TTL_SECONDS = 10
+CALL_LOGS_CACHE_MAX_USERS = 5_000
+_call_logs_cache: dict[str, tuple[float, int, list[dict]]] = {}
+
+# /scheduled-calls response: (expires_at_monotonic, response). The scheduler
+# also updates scheduled_calls, so this relies on the TTL as well.
+SCHEDULED_CALLS_CACHE_TTL_SECONDS = 10
+_scheduled_calls_cache: Optional[tuple[float, dict]] = None
+
+
+def invalidate_call_logs_cache(user_id: str) -> None:
+    """Drop a user's cached /call-logs responses after a call log write."""
+    _call_logs_cache.pop(user_id, None)
+
+
+def invalidate_scheduled_calls_cache() -> None:
+    """Drop the cached /scheduled-calls response after a scheduled_calls write."""
+    global _scheduled_calls_cache
+    _scheduled_calls_cache = None
+    # The scheduler's next wakeup may have moved too
+    get_call_scheduler().invalidate_next_due()
+
+
+# Expected failures from LiveKit room creation (API errors, transport, timeouts)
+_LIVEKIT_ROOM_ERRORS = (livekit_api.TwirpError, aiohttp.ClientError, asyncio.TimeoutError)
+
+
+def _new_room_name(user_id: str) -> str:
+    """Generate a unique LiveKit room name for a call to this user."""
+    call_id = secrets.token_hex(4)
+    return f"praxa-call-{user_id}-{call_id}"
+
+
+# Call triggers in progress: {user_id: (task, call_log_id, room_name)}. A
+# second trigger for the same user while one is running joins it rather than
+# creating another call log and LiveKit room.
+_call_triggers_inflight: dict[str, tuple[asyncio.Task, str, str]] = {}
+
+# Call log ids of in-flight triggers that were returned to a client before the
+# row existed; only these get a failed row written if the trigger gives up.
+_client_call_log_ids: set[str] = set()
+
+
+def start_call_trigger(
+    user_id: str,
+    reason: Optional[str] = None,
+    returns_call_log_id: bool = False,
+) -> tuple[asyncio.Task, str, str]:
+    """
+    Start triggering a call for a user, or return the trigger already in flight.
+    
+    Args:
+        user_id: The UUID of the user to call
+        reason: Optional reason passed to the agent in room metadata
+        returns_call_log_id: Whether the caller hands the call_log_id to a
+            client before the trigger finishes
+    
+    Returns:
+        Tuple of (task resolving to the trigger_call_for_user result, call_log_id, room_name)
+    """
+    inflight = _call_triggers_inflight.get(user_id)
+    if inflight:
+        logger.info(f"Call trigger already in progress for user {user_id}, joining it")
+        if reason:
+            # The in-flight call's room metadata is already set, so this
+            # reason never reaches the agent
+            logger.warning(f"Dropping call reason for user {user_id}, joined an in-flight call: {reason}")
+        if returns_call_log_id:
+            _client_call_log_ids.add(inflight[1])
+        return inflight
+    
+    call_log_id = str(uuid4())
+    room_name = _new_room_name(user_id)
+    task = asyncio.ensure_future(_trigger_call_for_user(
+        user_id,
+        reason=reason,
+        call_log_id=call_log_id,
+        room_name=room_name,
+    ))
+    entry = (task, call_log_id, room_name)
+    _call_triggers_inflight[user_id] = entry
+    if returns_call_log_id:
+        _client_call_log_ids.add(call_log_id)
+
+    def on_done(_: asyncio.Task) -> None:
+        _call_triggers_inflight.pop(user_id, None)
+        _client_call_log_ids.discard(call_log_id)
+
+    task.add_done_callback(on_done)
+    return entry
+
+
+async def trigger_call_for_user(
+    user_id: str,
+    reason: Optional[str] = None,
+) -> Optional[dict]:
+    """
+    Trigger a call for a specific user.
+    
+    Concurrent triggers for the same user share one call; see start_call_trigger.
+    
+    Returns:
+        Dict with call_log_id and room_name if successful, None if failed
+    """
+    task, _, _ = start_call_trigger(user_id, reason=reason)
+    return await asyncio.shield(task)
+
+
+async def _trigger_call_for_user(
+    user_id: str,
+    reason: Optional[str] = None,
+    call_log_id: Optional[str] = None,
+    room_name: Optional[str] = None,
+) -> Optional[dict]:
     """
     Trigger a call for a specific user.
     
     This function:
-    1. Fetches user data from Supabase
+    1. Fetches fresh user data from Supabase
     2. Creates a call log entry
     3. Creates a LiveKit room with phone number in metadata
     4. LiveKit dispatches the agent to the room
@@ -121,18 +458,50 @@ async def trigger_call_for_user(user_id: str, reason: Optional[str] = None) -> O
     
     Args:
         user_id: The UUID of the user to call
+        reason: Optional reason passed to the agent in room metadata
+        call_log_id: Pre-generated call log UUID (generated here if omitted)
+        room_name: Pre-generated LiveKit room name (generated here if omitted)
         
     Returns:
-        Dict with call_log_id and room_name if successful, None if failed
+        Dict with call_log_id and room_name if successful, None if failed.
+        On failure the call log is left with status "failed" if its row was
+        created or its id was already returned to a client.
     """
     db = get_supabase_client()
+    # The call log id is generated up front so the room metadata can carry
+    # it, letting the call log insert and room creation run concurrently.
+    call_log_id = call_log_id or str(uuid4())
+    room_name = room_name or _new_room_name(user_id)
+    phone_number = None
+    call_log_created = False
+    
+    async def record_failure(reason: str) -> None:
+        try:
+            if call_log_created:
+                await db.update_call_log(call_log_id, {"status": "failed", "failure_reason": reason})
+            elif call_log_id in _client_call_log_ids:
+                await db.record_failed_call_log(call_log_id, user_id, phone_number or "", room_name, reason)
+            else:
+                # Nobody holds this id, so there is no row to resolve
+                return
+        except Exception as e:
+            logger.error(f"Failed to record failed call log {call_log_id}: {e}")
+        invalidate_call_logs_cache(user_id)
     
     try:
-        # Get user with settings
-        user_data = await db.get_user_with_settings(user_id)
+        # These reads are independent, so run them concurrently; the Nylas
+        # grants are optional and the agent works without them. Settings are
+        # always read fresh here so a just-disabled user or a changed number
+        # is never dialed from a cached row.
+        user_data, ai_enabled, nylas_grants = await asyncio.gather(
+            db.get_user_with_settings(user_id),
+            db.is_ai_enabled(user_id),
+            db.get_nylas_grant_ids(user_id),
+        )
         
         if not user_data:
             logger.error(f"User not found: {user_id}")
+            await record_failure("User not found")
             return None
         
         user = user_data["user"]
@@ -140,26 +509,29 @@ async def trigger_call_for_user(user_id: str, reason: Optional[str] = None) -> O
         
         if not settings:
             logger.error(f"No settings found for user: {user_id}")
+            await record_failure("User has no settings configured")
             return None
         
         # Check if calls are enabled
         if not settings.get("calls_enabled", True):
             logger.info(f"Calls disabled for user: {user_id}")
+            await record_failure("Calls are disabled for this user")
             return None
 
-        if not await db.is_ai_enabled(user_id):
+        if not ai_enabled:
             logger.warning(f"AI disabled for user {user_id} — skipping call")
+            await record_failure("AI features are disabled for this account")
             return None
 
         # Get phone number
         phone_number = settings.get("phone_number")
         if not phone_number:
             logger.error(f"No phone number for user: {user_id}")
+            await record_failure("User has no phone number configured")
             return None
         
         # Normalize to strict E.164 format (digits only after +)
         # Handles formats like +1(646) 847-2984, (646) 847-2984, 6468472984, etc.
-        import re
         digits = re.sub(r'\D', '', phone_number)
         if phone_number.startswith("+"):
             phone_number = f"+{digits}"
@@ -179,101 +551,90 @@ async def trigger_call_for_user(user_id: str, reason: Optional[str] = None) -> O
             logger.warning(f"Phone not verified for user: {user_id}")
             # In production, you might want to skip unverified phones
         
-        # Generate room name
-        call_id = str(uuid4())[:8]
-        room_name = f"praxa-call-{user_id}-{call_id}"
-        
-        # Get Nylas grant IDs (calendar + email) — optional, agent works without them
-        calendar_grant_id = None
-        email_grant_id = None
-        try:
-            nylas_tokens = db.client.table("nylas_oauth_tokens").select("grant_id,integration_type").eq(
-                "user_id", user_id
-            ).execute()
-            
-            for token in (nylas_tokens.data or []):
-                if token.get("integration_type") == "calendar" and not calendar_grant_id:
-                    calendar_grant_id = token.get("grant_id")
-                elif token.get("integration_type") == "email" and not email_grant_id:
-                    email_grant_id = token.get("grant_id")
-            
+        # Nylas grant IDs (calendar + email)
+        calendar_grant_id = nylas_grants.get("calendar")
+        email_grant_id = nylas_grants.get("email")
+        if logger.isEnabledFor(logging.INFO):
             if calendar_grant_id:
                 logger.info(f"Found calendar grant for user {user_id}: {calendar_grant_id[:20]}...")
             if email_grant_id:
                 logger.info(f"Found email grant for user {user_id}: {email_grant_id[:20]}...")
             if not calendar_grant_id and not email_grant_id:
                 logger.info(f"No Nylas grants found for user {user_id} - agent will skip email/calendar features")
-        except Exception as e:
-            logger.warning(f"Error fetching Nylas grant IDs: {e}")
         
-        # Create call log entry
-        call_log = await db.create_call_log(
-            user_id=user_id,
-            phone_number=phone_number,
-            livekit_room_name=room_name
-        )
+        # Include metadata for agent (phone_number, calendar_grant_id)
+        metadata_dict = {
+            "user_id": user_id,
+            "call_log_id": call_log_id,
+            "phone_number": phone_number,
+        }
         
-        if not call_log:
-            logger.error(f"Failed to create call log for user: {user_id}")
-            return None
+        if calendar_grant_id:
+            metadata_dict["calendar_grant_id"] = calendar_grant_id
+        if email_grant_id:
+            metadata_dict["email_grant_id"] = email_grant_id
+        if reason:
+            metadata_dict["reason"] = reason
         
-        call_log_id = call_log["id"]
+        room_metadata = orjson.dumps(metadata_dict).decode()
         
         # Create LiveKit room with phone number in metadata
         # The agent will be dispatched to this room and will dial out via SIP
-        try:
-            lk_api = livekit_api.LiveKitAPI(
-                LIVEKIT_URL,
-                LIVEKIT_API_KEY,
-                LIVEKIT_API_SECRET
-            )
-            
-            # Include metadata for agent (phone_number, calendar_grant_id)
-            metadata_dict = {
-                "user_id": user_id,
-                "call_log_id": call_log_id,
-                "phone_number": phone_number,
-            }
-            
-            if calendar_grant_id:
-                metadata_dict["calendar_grant_id"] = calendar_grant_id
-            if email_grant_id:
-                metadata_dict["email_grant_id"] = email_grant_id
-            if reason:
-                metadata_dict["reason"] = reason
-            
-            room_metadata = json.dumps(metadata_dict)
-            
-            await lk_api.room.create_room(
+        lk_api = get_livekit_api()
+        
+        call_log, room = await asyncio.gather(
+            db.create_call_log(
+                user_id=user_id,
+                phone_number=phone_number,
+                livekit_room_name=room_name,
+                call_log_id=call_log_id,
+            ),
+            lk_api.room.create_room(
                 livekit_api.CreateRoomRequest(
                     name=room_name,
                     empty_timeout=300,  # 5 minutes
                     max_participants=3,  # agent + phone user + buffer
                     metadata=room_metadata
                 )
-            )
-            
-            await lk_api.aclose()
-            
-            logger.info(f"Created LiveKit room: {room_name} - agent will dial {phone_number}")
-            
-            # Update call log status
-            await db.update_call_log(call_log_id, {
-                "status": "initiated"
-            })
-            
-            return {"call_log_id": call_log_id, "room_name": room_name}
-            
-        except Exception as e:
-            logger.error(f"Failed to create LiveKit room: {e}")
+            ),
+            return_exceptions=True,
+        )
+        invalidate_call_logs_cache(user_id)
+        
+        if isinstance(call_log, BaseException) or not call_log:
+            logger.error(f"Failed to create call log for user {user_id}: {call_log}")
+            if not isinstance(room, BaseException):
+                # Tear the room down so the agent doesn't dial without a call log
+                try:
+                    await lk_api.room.delete_room(livekit_api.DeleteRoomRequest(room=room_name))
+                except Exception as e:
+                    logger.error(f"Failed to delete orphaned LiveKit room {room_name}: {e}")
+            await record_failure(f"Failed to create call log: {call_log}")
+            return None
+        call_log_created = True
+        
+        if isinstance(room, BaseException):
+            if isinstance(room, _LIVEKIT_ROOM_ERRORS):
+                logger.error(f"Failed to create LiveKit room: {room}")
+            else:
+                logger.error(
+                    f"Unexpected error creating LiveKit room: {room!r}",
+                    exc_info=room if logger.isEnabledFor(logging.DEBUG) else None,
+                )
             await db.update_call_log(call_log_id, {
                 "status": "failed",
-                "failure_reason": f"Failed to initiate call: {str(e)}"
+                "failure_reason": f"Failed to initiate call: {str(room)}"
             })
             return None
+        
+        # The call log was inserted as "initiated", so no follow-up update is needed
+        logger.info(f"Created LiveKit room: {room_name} - agent will dial {phone_number}")
+        
+        return {"call_log_id": call_log_id, "room_name": room_name}
             
     except Exception as e:
         logger.error(f"Error triggering call for user {user_id}: {e}")
+        await record_failure(f"Failed to initiate call: {e}")
         return None
 
 
@@ -294,6 +655,8 @@ async def lifespan(app: FastAPI):
     scheduler.set_trigger_callback(trigger_call_for_user)
     scheduler.start()
     
+    webhook_flusher = asyncio.create_task(_twilio_webhook_flusher())
+    
     logger.info("Praxa Backend started successfully")
     
     yield
@@ -301,26 +664,38 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Praxa Backend")
     scheduler.stop()
+    _twilio_webhook_queue.put_nowait(None)
+    await webhook_flusher
+    await close_livekit_api()
+    await close_http_client()
     logger.info("Praxa Backend shut down")
 
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address, default_limits=["100/hour"])
+# Initialize rate limiter. Counters are per process unless
+# RATE_LIMIT_STORAGE_URI points at shared storage (e.g. redis://...), in which
+# case they're shared by every worker.
+limiter = Limiter(
+    key_func=get_remote_address,
+    default_limits=["100/hour"],
+    storage_uri=os.getenv("RATE_LIMIT_STORAGE_URI", "memory://"),
+)
 
 # Create FastAPI app
 app = FastAPI(
     title="Praxa Backend",
     description="Backend service for Praxa productivity assistant voice calls",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add rate limiter to app state
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_exception_handler(_PrebuiltUnauthorized, _unauthorized_handler)
 
 # Configure CORS with environment-specific origins
-ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "").split(",") if os.getenv("ALLOWED_ORIGINS") else []
+ALLOWED_ORIGINS = [o.strip() for o in os.getenv("ALLOWED_ORIGINS", "").split(",") if o.strip()]
 
 # In development, allow localhost for testing
 if ENVIRONMENT == "development":
@@ -335,34 +710,42 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=ALLOWED_ORIGINS if ALLOWED_ORIGINS else [],
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PATCH", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 
 # ==================== Endpoints ====================
 
+# (epoch second, response): health probes within the same second share one response
+_health_response: Optional[tuple[int, HealthResponse]] = None
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """
     Health check endpoint for Railway deployment.
     
     Returns:
-        Health status with environment and timestamp
+        Health status with environment and timestamp (1-second resolution)
     """
-    return HealthResponse(
-        status="healthy",
-        environment=ENVIRONMENT,
-        timestamp=datetime.now(timezone.utc)
-    )
-
-
-@app.post("/trigger-call", response_model=TriggerCallResponse)
+    global _health_response
+    now_sec = int(time.time())
+    if _health_response is None or _health_response[0] != now_sec:
+        _health_response = (now_sec, HealthResponse(
+            status="healthy",
+            environment=ENVIRONMENT,
+            timestamp=datetime.now(timezone.utc)
+        ))
+    return _health_response[1]
+
+
+@app.post("/trigger-call", response_model=TriggerCallResponse, status_code=202)
 @limiter.limit("10/minute")  # Max 10 calls per minute per IP
 async def trigger_call(
     request: Request,
     call_request: TriggerCallRequest,
-    background_tasks: BackgroundTasks,
     auth: dict = Depends(verify_jwt_token)
 ):
     """
@@ -377,11 +760,12 @@ async def trigger_call(
     
     Args:
         request: Contains the user_id to call
-        background_tasks: FastAPI background tasks handler
         auth: Authenticated user info from JWT token (dependency)
         
     Returns:
-        TriggerCallResponse with call details
+        202 TriggerCallResponse with the call log id and room name; the call
+        itself is dispatched in the background, so poll the call log for status.
+        A repeat request while a call is still being set up gets the same ids.
     """
     user_id = str(call_request.user_id)
     authenticated_user_id = auth["user_id"]
@@ -392,9 +776,20 @@ async def trigger_call(
     
     logger.info(f"Trigger call request for user: {user_id} (authenticated: {authenticated_user_id})")
     
+    # A double-tap while the first call is still being set up gets the same call
+    inflight = _call_triggers_inflight.get(user_id)
+    if inflight:
+        _, call_log_id, room_name = inflight
+        return TriggerCallResponse(
+            success=True,
+            message="Call is being initiated",
+            call_log_id=call_log_id,
+            livekit_room_name=room_name
+        )
+    
     # Verify user exists
     db = get_supabase_client()
-    user_data = await db.get_user_with_settings(user_id)
+    user_data = await get_user_with_settings_cached(db, user_id)
     
     if not user_data:
         raise HTTPException(status_code=404, detail="User not found")
@@ -407,6 +802,9 @@ async def trigger_call(
     if not settings.get("phone_number"):
         raise HTTPException(status_code=400, detail="User has no phone number configured")
 
+    if not settings.get("calls_enabled", True):
+        raise HTTPException(status_code=400, detail="Calls are disabled for this user")
+
     if not await db.is_ai_enabled(user_id):
         raise HTTPException(status_code=403, detail="AI features are disabled for this account")
 
@@ -417,20 +815,35 @@ async def trigger_call(
             detail=f"Weekly voice call limit of {limit} reached ({used}/{limit} used). Resets after 7 days."
         )
 
-    # Trigger the call
-    result = await trigger_call_for_user(user_id)
-    
-    if not result:
-        raise HTTPException(status_code=500, detail="Failed to initiate call")
+    # Dispatch the call in the background; it rechecks fresh settings before dialing
+    _, call_log_id, room_name = start_call_trigger(user_id, returns_call_log_id=True)
     
     return TriggerCallResponse(
         success=True,
-        message="Call initiated successfully",
-        call_log_id=UUID(result["call_log_id"]),
-        livekit_room_name=result["room_name"]
+        message="Call is being initiated",
+        call_log_id=call_log_id,
+        livekit_room_name=room_name
     )
 
 
+# Twilio CallStatus values mapped to our call_logs statuses
+_TWILIO_STATUS_MAP = {
+    "initiated": CallStatus.INITIATED,
+    "ringing": CallStatus.RINGING,
+    "in-progress": CallStatus.IN_PROGRESS,
+    "completed": CallStatus.COMPLETED,
+    "busy": CallStatus.BUSY,
+    "no-answer": CallStatus.NO_ANSWER,
+    "failed": CallStatus.FAILED,
+    "canceled": CallStatus.CANCELED,
+}
+_TERMINAL_CALL_STATUSES = frozenset({
+    CallStatus.COMPLETED, CallStatus.FAILED,
+    CallStatus.NO_ANSWER, CallStatus.BUSY, CallStatus.CANCELED,
+})
+_FAILED_CALL_STATUSES = frozenset({CallStatus.FAILED, CallStatus.NO_ANSWER, CallStatus.BUSY})
+
+
 @app.post("/webhook/twilio")
 @limiter.limit("100/minute")  # Allow high volume from Twilio, but prevent abuse
 async def twilio_webhook(request: Request):
@@ -447,11 +860,13 @@ async def twilio_webhook(request: Request):
     - failed: Call failed
     - canceled: Call was canceled
     
-    This endpoint updates the call_log with the new status.
+    The event is queued and acknowledged immediately; the webhook flusher
+    applies queued events to call_logs in small batches.
     """
     try:
-        # Parse form data from Twilio
-        form_data = await request.form()
+        # Twilio posts a small application/x-www-form-urlencoded body, so parse
+        # it directly instead of going through the multipart form parser
+        form_data = dict(parse_qsl((await request.body()).decode()))
         
         call_sid = form_data.get("CallSid")
         call_status = form_data.get("CallStatus")
@@ -459,107 +874,165 @@ async def twilio_webhook(request: Request):
         
         if not call_sid:
             logger.warning("Twilio webhook received without CallSid")
-            return JSONResponse({"status": "ok"})
+            return ORJSONResponse({"status": "ok"})
         
         logger.info(f"Twilio webhook: {call_sid} -> {call_status}")
         
-        # Map Twilio status to our status
-        status_map = {
-            "initiated": CallStatus.INITIATED,
-            "ringing": CallStatus.RINGING,
-            "in-progress": CallStatus.IN_PROGRESS,
-            "completed": CallStatus.COMPLETED,
-            "busy": CallStatus.BUSY,
-            "no-answer": CallStatus.NO_ANSWER,
-            "failed": CallStatus.FAILED,
-            "canceled": CallStatus.CANCELED,
-        }
-        
-        our_status = status_map.get(call_status, call_status)
+        _twilio_webhook_queue.put_nowait({
+            "call_sid": call_sid,
+            "call_status": call_status,
+            "call_duration": call_duration,
+        })
         
-        # Update call log
-        db = get_supabase_client()
-        call_log = await db.get_call_log_by_sid(call_sid)
-        
-        if call_log:
-            updates = {"status": our_status}
-            
-            # Add duration if call completed
-            if call_duration:
-                try:
-                    updates["duration_seconds"] = int(call_duration)
-                except ValueError:
-                    pass
-            
-            # Add ended_at for terminal statuses
-            if our_status in [CallStatus.COMPLETED, CallStatus.FAILED, 
-                             CallStatus.NO_ANSWER, CallStatus.BUSY, 
-                             CallStatus.CANCELED]:
-                updates["ended_at"] = datetime.now(timezone.utc).isoformat()
-            
-            # Add failure reason for failed calls
-            if our_status in [CallStatus.FAILED, CallStatus.NO_ANSWER, CallStatus.BUSY]:
-                updates["failure_reason"] = f"Call {call_status}"
-            
-            await db.update_call_log(call_log["id"], updates)
-            logger.info(f"Updated call log {call_log['id']} to status {our_status}")
-
-            # Update the scheduled_call record that triggered this call
-            user_id = call_log.get("user_id")
-            if user_id and our_status in [
-                CallStatus.COMPLETED, CallStatus.FAILED,
-                CallStatus.NO_ANSWER, CallStatus.BUSY, CallStatus.CANCELED,
-            ]:
-                try:
-                    sc = await db.get_processing_scheduled_call_for_user(user_id)
-                    if sc:
-                        sc_id = sc["id"]
-                        sc_attempts = sc.get("attempt_count", 1)
-                        sc_max = sc.get("max_attempts", 3)
-                        if our_status == CallStatus.COMPLETED:
-                            await db.advance_scheduled_call(sc_id)
-                            logger.info(f"Call completed — advanced scheduled_call {sc_id} to next week")
-                        elif sc_attempts >= sc_max:
-                            await db.advance_scheduled_call(sc_id)
-                            logger.warning(f"Call missed after {sc_max} attempts — advanced scheduled_call {sc_id} to next week")
-                        else:
-                            await db.update_scheduled_call(sc_id, {"status": "pending"})
-                            logger.info(f"Call missed (attempt {sc_attempts}/{sc_max}) — scheduled_call {sc_id} reset for retry")
-                except Exception as sc_err:
-                    logger.error(f"Error updating scheduled_call after Twilio webhook for user {user_id}: {sc_err}")
-
-            # Send push notification for terminal statuses
-            if user_id and our_status in [
-                CallStatus.COMPLETED, CallStatus.FAILED,
-                CallStatus.NO_ANSWER, CallStatus.BUSY, CallStatus.CANCELED,
-            ]:
-                push_token = await get_user_push_token(user_id)
-                if push_token:
-                    if our_status == CallStatus.COMPLETED:
-                        ticket_id = await send_push_notification(
-                            push_token=push_token,
-                            title="Great Work",
-                            body="Check-in done. You're on track",
-                            data={"notificationType": "call_completed"},
-                        )
-                    else:
-                        ticket_id = await send_push_notification(
-                            push_token=push_token,
-                            title="We Missed You",
-                            body="No worries! Open Praxa to adjust your check-in time",
-                            data={"notificationType": "call_missed"},
-                        )
-                    if ticket_id:
-                        schedule_receipt_check(ticket_id, user_id)
-        else:
-            logger.warning(f"No call log found for SID: {call_sid}")
-        
-        return JSONResponse({"status": "ok"})
+        return ORJSONResponse({"status": "ok"})
         
     except Exception as e:
         logger.error(f"Error processing Twilio webhook: {e}")
         # Still return 200 to prevent Twilio retries
-        return JSONResponse({"status": "error", "message": str(e)})
+        return ORJSONResponse({"status": "error", "message": str(e)})
+
+
+# Twilio status events waiting to be written, drained by _twilio_webhook_flusher
+TWILIO_WEBHOOK_FLUSH_INTERVAL_SECONDS = 0.2
+TWILIO_WEBHOOK_MAX_BATCH = 100
+_twilio_webhook_queue: asyncio.Queue = asyncio.Queue()
+
+
+async def _twilio_webhook_flusher():
+    """
+    Background loop that applies queued Twilio status events in batches.
+    
+    A None item is the shutdown sentinel: everything queued before it is
+    applied, then the loop exits.
+    """
+    stopping = False
+    while not stopping:
+        event = await _twilio_webhook_queue.get()
+        if event is None:
+            return
+        batch = [event]
+        await asyncio.sleep(TWILIO_WEBHOOK_FLUSH_INTERVAL_SECONDS)
+        while len(batch) < TWILIO_WEBHOOK_MAX_BATCH and not _twilio_webhook_queue.empty():
+            event = _twilio_webhook_queue.get_nowait()
+            if event is None:
+                stopping = True
+                break
+            batch.append(event)
+        try:
+            await _apply_twilio_status_batch(batch)
+        except Exception as e:
+            logger.error(f"Error applying Twilio webhook batch: {e}")
+
+
+async def _apply_twilio_status_batch(events: list[dict]):
+    """
+    Apply a batch of Twilio status events.
+    
+    Events for the same CallSid are merged in arrival order, so each call log
+    gets one update carrying its latest status. Twilio callbacks can arrive
+    out of order, so a non-terminal status never replaces a terminal one.
+    """
+    ended_at = datetime.now(timezone.utc).isoformat()
+    merged: dict[str, dict] = {}
+    for event in events:
+        entry = merged.setdefault(event["call_sid"], {"updates": {}})
+        call_status = event["call_status"]
+        our_status = _TWILIO_STATUS_MAP.get(call_status, call_status)
+        if (
+            entry.get("our_status") in _TERMINAL_CALL_STATUSES
+            and our_status not in _TERMINAL_CALL_STATUSES
+        ):
+            logger.info(f"Ignoring late Twilio status {call_status} for ended call {event['call_sid']}")
+            continue
+        updates = entry["updates"]
+        updates["status"] = our_status
+        entry["call_status"] = call_status
+        entry["our_status"] = our_status
+        
+        # Add duration if call completed
+        if event["call_duration"]:
+            try:
+                updates["duration_seconds"] = int(event["call_duration"])
+            except ValueError:
+                pass
+        
+        # Add ended_at for terminal statuses
+        if our_status in _TERMINAL_CALL_STATUSES:
+            updates["ended_at"] = ended_at
+        
+        # Add failure reason for failed calls
+        if our_status in _FAILED_CALL_STATUSES:
+            updates["failure_reason"] = f"Call {call_status}"
+        else:
+            updates.pop("failure_reason", None)
+    
+    db = get_supabase_client()
+    call_logs = await db.get_call_logs_by_sids(list(merged))
+    for call_sid, entry in merged.items():
+        try:
+            call_log = call_logs.get(call_sid)
+            if not call_log:
+                logger.warning(f"No call log found for SID: {call_sid}")
+                continue
+            await _apply_twilio_status(db, call_log, entry["our_status"], entry["updates"])
+        except Exception as e:
+            logger.error(f"Error processing Twilio status for {call_sid}: {e}")
+
+
+async def _apply_twilio_status(db: SupabaseClient, call_log: dict, our_status, updates: dict):
+    """Write merged status updates for one call log and run terminal-status follow-ups."""
+    await db.update_call_log(call_log["id"], updates)
+    logger.info(f"Updated call log {call_log['id']} to status {our_status}")
+
+    # Update the scheduled_call record that triggered this call
+    user_id = call_log.get("user_id")
+    if user_id:
+        invalidate_call_logs_cache(user_id)
+    if user_id and our_status in _TERMINAL_CALL_STATUSES:
+        try:
+            sc = await db.get_processing_scheduled_call_for_user(user_id)
+            if sc:
+                sc_id = sc["id"]
+                sc_attempts = sc.get("attempt_count", 1)
+                sc_max = sc.get("max_attempts", 3)
+                if our_status == CallStatus.COMPLETED:
+                    await db.advance_scheduled_call(sc_id)
+                    logger.info(f"Call completed — advanced scheduled_call {sc_id} to next week")
+                elif sc_attempts >= sc_max:
+                    await db.advance_scheduled_call(sc_id)
+                    logger.warning(f"Call missed after {sc_max} attempts — advanced scheduled_call {sc_id} to next week")
+                else:
+                    await db.update_scheduled_call(sc_id, {"status": "pending"})
+                    logger.info(f"Call missed (attempt {sc_attempts}/{sc_max}) — scheduled_call {sc_id} reset for retry")
+        except Exception as sc_err:
+            logger.error(f"Error updating scheduled_call after Twilio webhook for user {user_id}: {sc_err}")
+        # After the writes, so a check running meanwhile can't re-cache stale state
+        invalidate_scheduled_calls_cache()
+
+    # Send push notification for terminal statuses
+    if user_id and our_status in _TERMINAL_CALL_STATUSES:
+        push_token = await get_user_push_token(user_id)
+        if push_token:
+            if our_status == CallStatus.COMPLETED:
+                ticket_id = await send_push_notification(
+                    push_token=push_token,
+                    title="Great Work",
+                    body="Check-in done. You're on track",
+                    data={"notificationType": "call_completed"},
+                )
+            else:
+                ticket_id = await send_push_notification(
+                    push_token=push_token,
+                    title="We Missed You",
+                    body="No worries! Open Praxa to adjust your check-in time",
+                    data={"notificationType": "call_missed"},
+                )
+            if ticket_id:
+                schedule_receipt_check(ticket_id, user_id)
+
+
+# Empty TwiML acknowledgement; replies go out via the Twilio REST API instead
+_EMPTY_TWIML = b'<?xml version="1.0" encoding="UTF-8"?><Response></Response>'
 
 
 @app.post("/webhook/twilio/inbound-sms")
@@ -591,10 +1064,7 @@ async def twilio_inbound_sms(request: Request, background_tasks: BackgroundTasks
     from services.twilio_sms import send_sms
     from services.sms_agent import handle_inbound
 
-    _empty = Response(
-        content='<?xml version="1.0" encoding="UTF-8"?><Response></Response>',
-        media_type="application/xml",
-    )
+    _empty = Response(content=_EMPTY_TWIML, media_type="application/xml")
 
     try:
         form = await request.form()
@@ -640,14 +1110,14 @@ async def slack_events(request: Request, background_tasks: BackgroundTasks):
     try:
         payload = await request.json()
     except Exception:
-        return JSONResponse({"ok": True})
+        return ORJSONResponse({"ok": True})
 
     from services.slack_agent import handle_event, enabled
     if not enabled():
-        return JSONResponse({"ok": True})
+        return ORJSONResponse({"ok": True})
 
     background_tasks.add_task(handle_event, payload)
-    return JSONResponse({"ok": True})
+    return ORJSONResponse({"ok": True})
 
 
 _NYLAS_EMAIL_EVENTS = {"message.created", "email.created", "message.updated"}
@@ -656,14 +1126,12 @@ _NYLAS_CALENDAR_EVENTS = {"event.created", "event.updated", "event.deleted"}
 
 def _verify_nylas_signature(request: Request, body_bytes: bytes) -> bool:
     """Return True if the Nylas HMAC-SHA256 signature is valid (or secret not configured)."""
-    import hashlib
-    import hmac as _hmac
     nylas_secret = os.getenv("NYLAS_WEBHOOK_SECRET", "")
     if not nylas_secret:
         return True
     sig = request.headers.get("X-Nylas-Signature", "")
-    expected = _hmac.new(nylas_secret.encode(), body_bytes, hashlib.sha256).hexdigest()
-    return _hmac.compare_digest(sig, expected)
+    expected = hmac.new(nylas_secret.encode(), body_bytes, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(sig, expected)
 
 
 @app.post("/webhook/nylas/email")
@@ -686,9 +1154,9 @@ async def nylas_email_webhook(request: Request, background_tasks: BackgroundTask
     if not _verify_nylas_signature(request, body_bytes):
         raise HTTPException(status_code=403, detail="Invalid Nylas signature")
     try:
-        payload = json.loads(body_bytes)
+        payload = orjson.loads(body_bytes)
     except Exception:
-        return JSONResponse({"ok": True})
+        return ORJSONResponse({"ok": True})
 
     event_type = payload.get("type", "")
     if event_type in _NYLAS_EMAIL_EVENTS:
@@ -697,7 +1165,7 @@ async def nylas_email_webhook(request: Request, background_tasks: BackgroundTask
         background_tasks.add_task(_handle_nylas_calendar_event, payload)
     else:
         logger.debug(f"[nylas_webhook] Unhandled event type '{event_type}' — ignoring")
-    return JSONResponse({"ok": True})
+    return ORJSONResponse({"ok": True})
 
 
 async def _handle_nylas_email_event(payload: dict) -> None:
@@ -812,13 +1280,19 @@ async def list_scheduled_calls():
     Returns:
         List of pending scheduled calls with user info
     """
+    global _scheduled_calls_cache
+    if _scheduled_calls_cache and _scheduled_calls_cache[0] > time.monotonic():
+        return _scheduled_calls_cache[1]
+    
     db = get_supabase_client()
     calls = await db.get_pending_scheduled_calls()
     
-    return {
+    response = {
         "count": len(calls),
         "scheduled_calls": calls
     }
+    _scheduled_calls_cache = (time.monotonic() + SCHEDULED_CALLS_CACHE_TTL_SECONDS, response)
+    return response
 
 
 @app.post("/schedule-call")
@@ -838,7 +1312,7 @@ async def schedule_call(request: Request, schedule_request: ScheduleCallRequest)
     """
     db = get_supabase_client()
     
-    # Get user settings
+    # Get user settings (fresh: the schedule is built from them)
     user_data = await db.get_user_with_settings(str(schedule_request.user_id))
     
     if not user_data:
@@ -858,6 +1332,7 @@ async def schedule_call(request: Request, schedule_request: ScheduleCallRequest)
     
     if not scheduled:
         raise HTTPException(status_code=400, detail="Calls are disabled for this user")
+    invalidate_scheduled_calls_cache()
     
     return {
         "success": True,
@@ -867,7 +1342,7 @@ async def schedule_call(request: Request, schedule_request: ScheduleCallRequest)
 
 @app.post("/sync-scheduled-calls")
 async def sync_scheduled_calls(
-    user_id: str,
+    user_id: UUID,
     auth: dict = Depends(verify_jwt_token)
 ):
     """
@@ -887,14 +1362,16 @@ async def sync_scheduled_calls(
     Returns:
         List of scheduled calls (created or unchanged)
     """
-    import hashlib
-    
+    user_id = str(user_id)
     authenticated_user_id = auth["user_id"]
     
     # Security: Only allow users to sync their own calls
     if user_id != authenticated_user_id:
         raise HTTPException(status_code=403, detail="Cannot sync calls for other users")
     
+    # The app syncs right after editing the schedule, so drop any cached copy
+    invalidate_user_settings_cache(user_id)
+    
     db = get_supabase_client()
     
     # Get user settings
@@ -911,6 +1388,8 @@ async def sync_scheduled_calls(
         checkin_schedule = settings.get("checkin_schedule", [])
         timezone_str = settings.get("timezone", "America/New_York")
         checkin_enabled = settings.get("checkin_enabled", True)
+        # One updated_at for every row this sync writes
+        now_iso = datetime.now(timezone.utc).isoformat()
         
         # Compute hash of current schedule for idempotency
         schedule_data = {
@@ -933,9 +1412,11 @@ async def sync_scheduled_calls(
             logger.info(f"Schedule unchanged for user {user_id} (hash: {current_hash[:8]}...), skipping sync")
             
             # Return existing pending calls
-            existing_calls = db.client.table("scheduled_calls").select("*").eq(
-                "user_id", user_id
-            ).eq("status", "pending").execute()
+            existing_calls = await asyncio.to_thread(
+                lambda: db.client.table("scheduled_calls").select("*").eq(
+                    "user_id", user_id
+                ).eq("status", "pending").execute()
+            )
             
             return {
                 "success": True,
@@ -946,18 +1427,23 @@ async def sync_scheduled_calls(
         
         if not checkin_enabled or not checkin_schedule:
             # Cancel all pending calls if checkin is disabled or no schedule
-            db.client.table("scheduled_calls").update({
-                "status": "cancelled",
-                "updated_at": datetime.now(timezone.utc).isoformat()
-            }).eq("user_id", user_id).eq("status", "pending").execute()
+            await asyncio.to_thread(
+                lambda: db.client.table("scheduled_calls").update({
+                    "status": "cancelled",
+                    "updated_at": now_iso
+                }).eq("user_id", user_id).eq("status", "pending").execute()
+            )
             
-            hash_update = db.client.table("user_settings").update({
-                "checkin_schedule_hash": current_hash,
-                "updated_at": datetime.now(timezone.utc).isoformat()
-            }).eq("user_id", user_id).execute()
+            hash_update = await asyncio.to_thread(
+                lambda: db.client.table("user_settings").update({
+                    "checkin_schedule_hash": current_hash,
+                    "updated_at": now_iso
+                }).eq("user_id", user_id).execute()
+            )
             if not hash_update.data:
                 logger.error(f"Failed to persist checkin_schedule_hash (disabled) for user {user_id}")
 
+            invalidate_scheduled_calls_cache()
             logger.info(f"Cancelled all pending calls for user {user_id} (checkin disabled or no schedule)")
             return {"success": True, "scheduled_calls": [], "count": 0}
         
@@ -965,8 +1451,6 @@ async def sync_scheduled_calls(
         logger.info(f"Schedule changed for user {user_id} (old: {stored_hash[:8] if stored_hash else 'none'}... new: {current_hash[:8]}...)")
 
         # Calculate UTC datetimes for all current schedule slots
-        from zoneinfo import ZoneInfo
-        from datetime import timedelta as _td
         user_tz = ZoneInfo(timezone_str)
         now_local = datetime.now(user_tz)
         target_slots: list[str] = []
@@ -981,48 +1465,59 @@ async def sync_scheduled_calls(
                 continue
             target_weekday = 6 if day == 0 else day - 1
             days_ahead = (target_weekday - now_local.weekday()) % 7
-            candidate = now_local.replace(hour=hour, minute=minute, second=0, microsecond=0) + _td(days=days_ahead)
+            candidate = now_local.replace(hour=hour, minute=minute, second=0, microsecond=0) + timedelta(days=days_ahead)
             if candidate <= now_local:
-                candidate += _td(days=7)
+                candidate += timedelta(days=7)
             target_slots.append(candidate.astimezone(ZoneInfo("UTC")).isoformat())
 
         # Cancel pending records whose slot is no longer in the schedule
-        existing_pending = db.client.table("scheduled_calls").select("id, scheduled_for").eq(
-            "user_id", user_id
-        ).eq("status", "pending").execute()
+        existing_pending = await asyncio.to_thread(
+            lambda: db.client.table("scheduled_calls").select("id, scheduled_for").eq(
+                "user_id", user_id
+            ).eq("status", "pending").execute()
+        )
 
         def _normalise_iso(s: str) -> str:
-            from datetime import timezone as _tz
             dt = datetime.fromisoformat(s.replace(" ", "T"))
             if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=_tz.utc)
-            return dt.astimezone(_tz.utc).replace(microsecond=0).isoformat()
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt.astimezone(timezone.utc).replace(microsecond=0).isoformat()
 
         normalised_targets = {_normalise_iso(s) for s in target_slots}
-        ids_to_cancel = [
-            r["id"] for r in (existing_pending.data or [])
-            if _normalise_iso(r["scheduled_for"]) not in normalised_targets
-        ]
+        ids_to_cancel = []
+        kept_slots: set[str] = set()
+        for r in (existing_pending.data or []):
+            slot = _normalise_iso(r["scheduled_for"])
+            if slot in normalised_targets:
+                kept_slots.add(slot)
+            else:
+                ids_to_cancel.append(r["id"])
         if ids_to_cancel:
-            db.client.table("scheduled_calls").update({
-                "status": "cancelled",
-                "updated_at": datetime.now(timezone.utc).isoformat()
-            }).in_("id", ids_to_cancel).execute()
+            await asyncio.to_thread(
+                lambda: db.client.table("scheduled_calls").update({
+                    "status": "cancelled",
+                    "updated_at": now_iso
+                }).in_("id", ids_to_cancel).execute()
+            )
             logger.info(f"Cancelled {len(ids_to_cancel)} removed slots for user {user_id}")
 
-        # Create (or skip if already active) scheduled calls for current slots
+        # Create scheduled calls for current slots, skipping those still pending
         created_calls = await db.create_all_scheduled_calls(
             user_id=user_id,
             checkin_schedule=checkin_schedule,
             timezone=timezone_str,
-            checkin_enabled=checkin_enabled
+            checkin_enabled=checkin_enabled,
+            existing_slots=kept_slots
         )
+        invalidate_scheduled_calls_cache()
 
         # Store new hash and log if it failed
-        hash_update = db.client.table("user_settings").update({
-            "checkin_schedule_hash": current_hash,
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        }).eq("user_id", user_id).execute()
+        hash_update = await asyncio.to_thread(
+            lambda: db.client.table("user_settings").update({
+                "checkin_schedule_hash": current_hash,
+                "updated_at": now_iso
+            }).eq("user_id", user_id).execute()
+        )
         if not hash_update.data:
             logger.error(f"Failed to persist checkin_schedule_hash for user {user_id} — idempotency check will not work next sync")
 
@@ -1039,27 +1534,49 @@ async def sync_scheduled_calls(
         raise HTTPException(status_code=500, detail="Failed to sync scheduled calls")
 
 
+# Columns returned by /call-logs. The large transcript and task list columns
+# are left out; /call-log/{call_log_id} returns the full row
+_CALL_LOG_LIST_COLUMNS = (
+    "id, user_id, call_sid, livekit_room_name, phone_number, scheduled_at, "
+    "started_at, ended_at, duration_seconds, status, failure_reason, "
+    "summary, tasks_discussed, goals_updated, "
+    "user_rating, user_feedback, created_at, updated_at"
+)
+
+
 @app.get("/call-logs/{user_id}")
-async def get_user_call_logs(user_id: str, limit: int = 10):
+async def get_user_call_logs(user_id: str, limit: int = 10, debug: bool = False):
     """
     Get call history for a user.
     
     Args:
         user_id: The UUID of the user
         limit: Maximum number of records to return
+        debug: Add a _transcript_debug summary to each log (bypasses the cache)
         
     Returns:
         List of call logs for the user
     """
+    if not debug:
+        cached = _call_logs_cache.get(user_id)
+        # Usable if it was fetched with at least this limit, or it already
+        # holds every row the user has
+        if cached and cached[0] > time.monotonic() and (cached[1] >= limit or len(cached[2]) < cached[1]):
+            call_logs = cached[2][:limit]
+            return {"count": len(call_logs), "call_logs": call_logs}
+    
     db = get_supabase_client()
+    columns = f"{_CALL_LOG_LIST_COLUMNS}, transcript" if debug else _CALL_LOG_LIST_COLUMNS
     
     try:
-        response = db.client.table("call_logs").select("*").eq(
-            "user_id", user_id
-        ).order("created_at", desc=True).limit(limit).execute()
+        response = await asyncio.to_thread(
+            lambda: db.client.table("call_logs").select(columns).eq(
+                "user_id", user_id
+            ).order("created_at", desc=True).limit(limit).execute()
+        )
         
         # Add debug info about transcripts
-        if response.data:
+        if debug and response.data:
             for log in response.data:
                 transcript = log.get("transcript")
                 if transcript:
@@ -1069,13 +1586,54 @@ async def get_user_call_logs(user_id: str, limit: int = 10):
                         "is_empty": not bool(transcript)
                     }
         
-        return {
+        result = {
             "count": len(response.data) if response.data else 0,
             "call_logs": response.data or []
         }
     except Exception as e:
         logger.error(f"Error fetching call logs: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch call logs")
+    
+    if debug:
+        return result
+    if user_id not in _call_logs_cache:
+        while len(_call_logs_cache) >= CALL_LOGS_CACHE_MAX_USERS:
+            _call_logs_cache.pop(next(iter(_call_logs_cache)))
+    _call_logs_cache[user_id] = (time.monotonic() + CALL_LOGS_CACHE_TTL_SECONDS, limit, result["call_logs"])
+    return result
+
+
+@app.get("/call-log/{call_log_id}")
+async def get_call_log(call_log_id: str, auth: dict = Depends(verify_jwt_token)):
+    """
+    Get a single call log with its transcript and task lists.
+    
+    **Requires Authentication**: Supabase JWT token in Authorization header
+    
+    Args:
+        call_log_id: The UUID of the call log
+        auth: Authenticated user info from JWT token (dependency)
+        
+    Returns:
+        The full call log row, if it belongs to the authenticated user
+    """
+    db = get_supabase_client()
+    user_id = auth["user_id"]
+    
+    try:
+        response = await asyncio.to_thread(
+            lambda: db.client.table("call_logs").select("*").eq(
+                "id", call_log_id
+            ).eq("user_id", user_id).maybe_single().execute()
+        )
+    except Exception as e:
+        logger.error(f"Error fetching call log: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch call log")
+    
+    if not response or not response.data:
+        raise HTTPException(status_code=404, detail="Call log not found")
+    
+    return response.data
 
 
 @app.get("/call-log/{call_log_id}/debug")
@@ -1092,7 +1650,9 @@ async def debug_call_log(call_log_id: str):
     db = get_supabase_client()
     
     try:
-        response = db.client.table("call_logs").select("*").eq("id", call_log_id).single().execute()
+        response = await asyncio.to_thread(
+            lambda: db.client.table("call_logs").select("*").eq("id", call_log_id).single().execute()
+        )
         
         if not response.data:
             raise HTTPException(status_code=404, detail="Call log not found")
@@ -1331,8 +1891,7 @@ async def _do_generate_session_brief(req: GenerateSessionBriefRequest):
             temperature=0.2,
         )
 
-        import json as _json
-        brief = _json.loads(resp.choices[0].message.content or "{}")
+        brief = json.loads(resp.choices[0].message.content or "{}")
 
         db = get_supabase_client()
         row = {
@@ -1379,6 +1938,8 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=PORT,
-        reload=ENVIRONMENT == "development"
+        reload=ENVIRONMENT == "development",
+        loop="auto",  # uvloop where installed (not on Windows), asyncio otherwise
+        http="httptools",
     )
 
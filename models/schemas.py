@@ -2,10 +2,11 @@
 
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class CallStatus(str, Enum):
@@ -67,8 +68,7 @@ class User(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserSettings(BaseModel):
@@ -88,12 +88,11 @@ class UserSettings(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
-    @property
+    @cached_property
     def full_phone_number(self) -> Optional[str]:
-        """Get the full phone number in E.164 format."""
+        """Get the full phone number in E.164 format (computed once per instance)."""
         if not self.phone_number:
             return None
         # If phone_number already has country code, return as is
@@ -117,8 +116,7 @@ class Bucket(BaseModel):
     # Nested loops when fetched with joins
     loops: list["Loop"] = Field(default_factory=list)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Subtask(BaseModel):
@@ -134,8 +132,7 @@ class Subtask(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Loop(BaseModel):
@@ -158,8 +155,7 @@ class Loop(BaseModel):
     # Nested subtasks when fetched with joins
     subtasks: list["Subtask"] = Field(default_factory=list)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CallLog(BaseModel):
@@ -186,8 +182,7 @@ class CallLog(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ScheduledCall(BaseModel):
@@ -204,8 +199,7 @@ class ScheduledCall(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # API Request/Response Models
@@ -226,7 +220,7 @@ class TriggerCallResponse(BaseModel):
     """Response for trigger call endpoint."""
     success: bool
     message: str
-    call_log_id: Optional[UUID] = None
+    call_log_id: Optional[str] = None  # UUID string, generated server-side
     livekit_room_name: Optional[str] = None
 
 
@@ -240,8 +234,7 @@ class TwilioWebhookRequest(BaseModel):
     CallDuration: Optional[str] = None
     Timestamp: Optional[str] = None
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class HealthResponse(BaseModel):
@@ -265,6 +258,8 @@ class UserContext(BaseModel):
     overdue_tasks: list[Loop]
     recently_completed: list[Loop]
 
+    model_config = ConfigDict(frozen=True)
+
 
 class TaskUpdate(BaseModel):
     """An update to be made to a task."""
@@ -272,6 +267,8 @@ class TaskUpdate(BaseModel):
     action: str  # "complete", "add_note", "reschedule", "update_status"
     value: Optional[str] = None  # Note text, new due date, etc.
 
+    model_config = ConfigDict(frozen=True)
+
 
 class NewTask(BaseModel):
     """A new task to be created."""
@@ -282,6 +279,8 @@ class NewTask(BaseModel):
     due_date: Optional[datetime] = None
     is_this_week: bool = False
 
+    model_config = ConfigDict(frozen=True)
+
 
 class CallSummary(BaseModel):
     """Summary of a completed call."""
@@ -293,3 +292,4 @@ class CallSummary(BaseModel):
     goals_updated: list[dict]
     duration_seconds: int
 
+    model_config = ConfigDict(frozen=True)
@@ -1,6 +1,8 @@
-from .supabase_client import SupabaseClient
-from .twilio_service import TwilioService
-from .scheduler import CallScheduler
+_EXPORTS = {
+    "SupabaseClient": ".supabase_client",
+    "TwilioService": ".twilio_service",
+    "CallScheduler": ".scheduler",
+}
 
 __all__ = [
     "SupabaseClient",
@@ -8,3 +10,15 @@ __all__ = [
     "CallScheduler",
 ]
 
+
+def __getattr__(name):
+    # Resolve re-exports on first access so importing one submodule
+    # (e.g. the agent worker's services.supabase_client) does not also
+    # pull in apscheduler and the LiveKit SIP client.
+    if name in _EXPORTS:
+        from importlib import import_module
+
+        value = getattr(import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -24,9 +24,16 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 
 
+# Shared Supabase client so its HTTP connections stay warm across calls
+_supabase: Optional[Client] = None
+
+
 def _get_supabase() -> Client:
-    from supabase import create_client
-    return create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+    global _supabase
+    if _supabase is None:
+        from supabase import create_client
+        _supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+    return _supabase
 
 
 async def _get_embedding(text: str) -> Optional[list[float]]:
@@ -11,6 +11,28 @@ EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
 EXPO_RECEIPTS_URL = "https://exp.host/--/api/v2/push/getReceipts"
 RECEIPT_CHECK_DELAY_SECONDS = 15 * 60  # 15 minutes
 
+# Shared client so pushes reuse pooled keep-alive connections to Expo
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the shared Expo HTTP client."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared Expo HTTP client (called on app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 async def send_push_notification(
     push_token: str,
@@ -54,27 +76,26 @@ async def send_push_notification(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                EXPO_PUSH_URL,
-                json=payload,
-                headers={
-                    "Accept": "application/json",
-                    "Accept-Encoding": "gzip, deflate",
-                    "Content-Type": "application/json",
-                },
-            )
-            response.raise_for_status()
-            result = response.json()
-
-            ticket = result.get("data", {})
-            if ticket.get("status") == "error":
-                logger.error(f"Expo push error: {ticket.get('message')} (details: {ticket.get('details')})")
-                return None
-
-            ticket_id = ticket.get("id")
-            logger.info(f"Push notification sent: '{title}' → {push_token[:30]}... (ticket: {ticket_id})")
-            return ticket_id
+        response = await get_http_client().post(
+            EXPO_PUSH_URL,
+            json=payload,
+            headers={
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip, deflate",
+                "Content-Type": "application/json",
+            },
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        ticket = result.get("data", {})
+        if ticket.get("status") == "error":
+            logger.error(f"Expo push error: {ticket.get('message')} (details: {ticket.get('details')})")
+            return None
+
+        ticket_id = ticket.get("id")
+        logger.info(f"Push notification sent: '{title}' → {push_token[:30]}... (ticket: {ticket_id})")
+        return ticket_id
 
     except httpx.HTTPStatusError as e:
         logger.error(f"Expo Push API HTTP error: {e.response.status_code} - {e.response.text}")
@@ -100,17 +121,16 @@ async def check_push_receipt(ticket_id: str, user_id: str) -> None:
     await asyncio.sleep(RECEIPT_CHECK_DELAY_SECONDS)
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                EXPO_RECEIPTS_URL,
-                json={"ids": [ticket_id]},
-                headers={
-                    "Accept": "application/json",
-                    "Content-Type": "application/json",
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
+        response = await get_http_client().post(
+            EXPO_RECEIPTS_URL,
+            json={"ids": [ticket_id]},
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
 
         receipt = data.get("data", {}).get(ticket_id, {})
 
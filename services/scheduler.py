@@ -1,19 +1,43 @@
 """Background scheduler for triggering scheduled calls."""
 
 import os
+import time
 import asyncio
 import logging
+from contextvars import ContextVar
 from datetime import datetime, timezone
 from typing import Optional, Callable, Awaitable
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
-from .supabase_client import get_supabase_client
+from .supabase_client import SupabaseClient, get_supabase_client
 from .push_service import send_push_notification, get_user_push_token, schedule_receipt_check
 
 logger = logging.getLogger(__name__)
 
+# Cap on scheduled calls set up at once per check, to bound concurrent
+# Supabase writes and LiveKit/SIP initiations
+MAX_CONCURRENT_CALL_TRIGGERS = 10
+
+# Due calls fetched per run; a full page schedules an immediate follow-up run
+# so a backlog (e.g. after downtime) drains in steady pages
+PENDING_CALLS_BATCH_SIZE = 200
+
+# Id of the scheduled call being processed by the current task. Tasks spawned
+# from there (e.g. the call trigger) inherit it, so their logs carry it too.
+current_scheduled_call_id: ContextVar[Optional[str]] = ContextVar("scheduled_call_id", default=None)
+
+
+class ScheduledCallLogFilter(logging.Filter):
+    """Expose the current scheduled call id to log formats as %(scheduled_call)s."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        call_id = current_scheduled_call_id.get()
+        record.scheduled_call = f" [scheduled_call={call_id}]" if call_id else ""
+        return True
+
 
 class CallScheduler:
     """
@@ -26,7 +50,15 @@ class CallScheduler:
     def __init__(self):
         self.scheduler = AsyncIOScheduler()
         self.trigger_callback: Optional[Callable[[str], Awaitable[None]]] = None
+        # Resolved once in start(); jobs only run after that
+        self.db: Optional[SupabaseClient] = None
         self._running = False
+        # Held while a check runs so the poll and wakeup jobs never overlap
+        self._check_lock = asyncio.Lock()
+        # Last get_next_pending_call_time result, reused by idle ticks until
+        # a scheduled_calls write invalidates it
+        self._next_due: Optional[datetime] = None
+        self._next_due_known = False
 
     def set_trigger_callback(self, callback: Callable[[str], Awaitable[None]]):
         """
@@ -37,74 +69,210 @@ class CallScheduler:
         """
         self.trigger_callback = callback
 
+    def invalidate_next_due(self):
+        """Forget the cached next due time after scheduled_calls were written."""
+        self._next_due_known = False
+
     async def check_and_trigger_calls(self):
         """
         Check for pending scheduled calls and trigger them.
         
         This runs every 5 minutes and:
-        1. Queries scheduled_calls where scheduled_for <= now AND status = 'pending'
-        2. For each, updates status to 'processing'
-        3. Triggers the agent to make the call
-        4. Handles failures (increment attempt_count, reschedule if < max_attempts)
+        1. Queries up to PENDING_CALLS_BATCH_SIZE scheduled_calls where
+           scheduled_for <= now AND status = 'pending' AND any retry backoff
+           has elapsed
+        2. Marks calls for users without calls enabled / a verified phone as
+           'skipped' in one bulk update
+        3. For each remaining call, updates status to 'processing' and
+           triggers the agent to make the call
+        4. Handles failures (increment attempt_count, retry with exponential
+           backoff if < max_attempts)
         """
         if not self.trigger_callback:
             logger.warning("No trigger callback set, skipping scheduled call check")
             return
+        # The interval job and the wakeup job are separate jobs, so
+        # max_instances doesn't stop them overlapping; the running check
+        # schedules the follow-up wakeup itself
+        if self._check_lock.locked():
+            logger.info("Scheduled call check already running, skipping")
+            return
+
+        async with self._check_lock:
+            more_due = await self._check_due_calls(self.trigger_callback)
+        # Scheduled outside the lock so an immediate wakeup isn't skipped
+        await self._schedule_next_wakeup(more_due)
+
+    async def _check_due_calls(self, trigger: Callable[[str], Awaitable[None]]) -> bool:
+        """
+        Run one pass over the due scheduled calls.
+
+        Returns:
+            True if a full page was fetched and more calls may already be due
+        """
+        more_due = False
 
         try:
-            db = get_supabase_client()
-            pending_calls = await db.get_pending_scheduled_calls()
+            db = self.db
+            pending_calls = await db.get_pending_scheduled_calls(limit=PENDING_CALLS_BATCH_SIZE)
             
             if not pending_calls:
                 logger.debug("No pending scheduled calls")
-                return
-            
-            logger.info(f"Found {len(pending_calls)} pending scheduled calls")
+                return False
             
+            logger.info("Found %s pending scheduled calls", len(pending_calls))
+            # This run writes scheduled_calls, so the next due time may move
+            self._next_due_known = False
+
+            now = datetime.now(timezone.utc)
+            callable_calls = []
+            skip_ids = []
             for scheduled_call in pending_calls:
-                await self._process_scheduled_call(scheduled_call)
-                
+                if self._is_callable(scheduled_call.get("user_settings") or {}):
+                    callable_calls.append(scheduled_call)
+                else:
+                    skip_ids.append(scheduled_call["id"])
+
+            # Only worth an immediate follow-up run if every fetched call left
+            # the due set; otherwise the same page would come straight back
+            all_written = True
+            if skip_ids:
+                try:
+                    skipped = await db.skip_scheduled_calls(skip_ids)
+                    logger.info("Skipped %s scheduled calls (calls disabled or no verified phone)", skipped)
+                except Exception as e:
+                    logger.error("Failed to skip %s scheduled calls: %s", len(skip_ids), e)
+                    all_written = False
+
+            now_iso = now.isoformat()
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_CALL_TRIGGERS)
+
+            async def process(scheduled_call: dict) -> Optional[str]:
+                async with semaphore:
+                    return await self._process_scheduled_call(scheduled_call, trigger, now_iso)
+
+            results = await asyncio.gather(
+                *(process(scheduled_call) for scheduled_call in callable_calls),
+                return_exceptions=True,
+            )
+
+            # Failed attempts are reset in one write per target status
+            ids_by_status: dict[str, list[str]] = {}
+            for scheduled_call, result in zip(callable_calls, results):
+                if isinstance(result, BaseException):
+                    logger.error("Error processing scheduled call %s: %s", scheduled_call.get("id"), result)
+                    all_written = False
+                elif result:
+                    ids_by_status.setdefault(result, []).append(scheduled_call["id"])
+
+            for status, call_ids in ids_by_status.items():
+                try:
+                    # Stamping the attempt keeps retries out of the due set
+                    # until their backoff elapses, even if the claim failed
+                    await db.set_scheduled_calls_status(call_ids, status, last_attempt_at=now_iso)
+                    logger.info("Set %s scheduled calls to %s", len(call_ids), status)
+                except Exception as e:
+                    logger.error("Failed to set %s scheduled calls to %s: %s", len(call_ids), status, e)
+                    all_written = False
+
+            more_due = all_written and len(pending_calls) >= PENDING_CALLS_BATCH_SIZE
+
+        except Exception as e:
+            logger.error("Error checking scheduled calls: %s", e)
+
+        return more_due
+
+    async def _schedule_next_wakeup(self, more_due: bool = False):
+        """
+        Schedule a one-off check at the next pending call's scheduled_for.
+
+        The 5-minute poll stays as the safety net; this only adds an earlier
+        run when the next call is due before that poll would pick it up, or
+        right away when the last run hit PENDING_CALLS_BATCH_SIZE. An idle
+        tick reuses the last lookup unless it was invalidated or has passed,
+        so it costs only the due-calls query.
+        """
+        try:
+            if more_due:
+                next_due = datetime.now(timezone.utc)
+            else:
+                if not self._next_due_known or (
+                    self._next_due is not None and self._next_due <= datetime.now(timezone.utc)
+                ):
+                    self._next_due = await self.db.get_next_pending_call_time()
+                    self._next_due_known = True
+                next_due = self._next_due
+                if next_due is None:
+                    return
+
+                poll_job = self.scheduler.get_job("check_scheduled_calls")
+                if poll_job and poll_job.next_run_time and next_due >= poll_job.next_run_time:
+                    return
+
+            self.scheduler.add_job(
+                self.check_and_trigger_calls,
+                trigger=DateTrigger(run_date=next_due),
+                id="check_scheduled_calls_wakeup",
+                name="Check scheduled calls at next due time",
+                misfire_grace_time=120,
+                replace_existing=True,
+            )
+            logger.debug("Next scheduled call check at %s", next_due.isoformat())
         except Exception as e:
-            logger.error(f"Error checking scheduled calls: {e}")
+            logger.error("Failed to schedule next call check: %s", e)
+
+    @staticmethod
+    def _is_callable(user_settings: dict) -> bool:
+        """Whether the user has calls enabled and a verified phone number."""
+        return bool(
+            user_settings.get("calls_enabled", True)
+            and user_settings.get("phone_number")
+            and user_settings.get("phone_verified", False)
+        )
 
-    async def _process_scheduled_call(self, scheduled_call: dict):
+    async def _process_scheduled_call(
+        self,
+        scheduled_call: dict,
+        trigger: Callable[[str], Awaitable[None]],
+        now_iso: str,
+    ) -> Optional[str]:
         """
         Process a single scheduled call.
 
+        Callers only pass records whose user has calls enabled and a verified
+        phone (see _is_callable).
+
         Flow:
-          1. Mark as processing, increment attempt_count.
-          2. Validate user settings (calls enabled, phone verified).
-          3. Trigger the call via LiveKit/Twilio.
+          1. Claim the record: mark as processing and increment attempt_count,
+             only if it is still pending.
+          2. Trigger the call via LiveKit/Twilio.
              - Success: record stays in 'processing'; the Twilio status webhook
                will advance it to next week (completed) or reset to pending (missed).
              - Failure (exception or None result): retry up to max_attempts.
                After exhausting attempts, advance the record to next week.
+
+        Returns:
+            The status the record should be reset to after a failed attempt
+            ('pending' to retry, 'failed' if it could not be advanced), or None.
+            check_and_trigger_calls applies these in bulk.
         """
         call_id = scheduled_call["id"]
         user_id = scheduled_call["user_id"]
         attempt_count = scheduled_call.get("attempt_count", 0)
         max_attempts = scheduled_call.get("max_attempts", 3)
-
-        db = get_supabase_client()
+        db = self.db
+        # Each record runs in its own gather task, so this stays task-local
+        current_scheduled_call_id.set(call_id)
 
         try:
-            await db.update_scheduled_call(call_id, {
+            claimed = await db.update_scheduled_call(call_id, {
                 "status": "processing",
-                "last_attempt_at": datetime.now(timezone.utc).isoformat(),
+                "last_attempt_at": now_iso,
                 "attempt_count": attempt_count + 1,
-            })
-
-            user_settings = scheduled_call.get("user_settings", {})
-            if not user_settings.get("calls_enabled", True):
-                logger.info(f"Calls disabled for user {user_id}, skipping")
-                await db.update_scheduled_call(call_id, {"status": "skipped"})
-                return
-
-            phone_number = user_settings.get("phone_number")
-            if not phone_number or not user_settings.get("phone_verified", False):
-                logger.warning(f"No verified phone for user {user_id}, skipping")
-                await db.update_scheduled_call(call_id, {"status": "skipped"})
-                return
+            }, expected_status="pending")
+            if not claimed:
+                logger.info("Scheduled call %s is no longer pending, skipping", call_id)
+                return None
 
             if attempt_count == 0:
                 push_token = await get_user_push_token(user_id)
@@ -118,28 +286,35 @@ class CallScheduler:
                     if ticket_id:
                         schedule_receipt_check(ticket_id, user_id)
 
-            logger.info(f"Triggering call for user {user_id} (attempt {attempt_count + 1}/{max_attempts})")
-            result = await self.trigger_callback(user_id)
+            logger.info("Triggering call for user %s (attempt %s/%s)", user_id, attempt_count + 1, max_attempts)
+            trigger_started = time.perf_counter()
+            result = await trigger(user_id)
+            trigger_ms = (time.perf_counter() - trigger_started) * 1000
 
             if not result:
                 raise Exception(f"Call initiation returned no result for user {user_id}")
 
-            logger.info(f"Call initiated for user {user_id} — scheduled_call {call_id} waiting for Twilio outcome")
+            logger.info(
+                "Call initiated for user %s in %.0f ms — scheduled_call %s waiting for Twilio outcome",
+                user_id, trigger_ms, call_id,
+            )
+            return None
 
         except Exception as e:
-            logger.error(f"Error initiating scheduled call {call_id}: {e}")
+            logger.error("Error initiating scheduled call %s: %s", call_id, e)
 
             current_attempt = attempt_count + 1
             if current_attempt >= max_attempts:
-                logger.warning(f"Scheduled call {call_id} exhausted {max_attempts} attempts, advancing to next week")
+                logger.warning("Scheduled call %s exhausted %s attempts, advancing to next week", call_id, max_attempts)
                 try:
                     await db.advance_scheduled_call(call_id)
                 except Exception as advance_err:
-                    logger.error(f"Failed to advance scheduled call {call_id} after max attempts: {advance_err}")
-                    await db.update_scheduled_call(call_id, {"status": "failed"})
-            else:
-                await db.update_scheduled_call(call_id, {"status": "pending"})
-                logger.info(f"Scheduled call {call_id} will retry (attempt {current_attempt}/{max_attempts})")
+                    logger.error("Failed to advance scheduled call %s after max attempts: %s", call_id, advance_err)
+                    return "failed"
+                return None
+
+            logger.info("Scheduled call %s will retry (attempt %s/%s)", call_id, current_attempt, max_attempts)
+            return "pending"
 
     async def _run_task_notifications(self):
         """
@@ -156,12 +331,12 @@ class CallScheduler:
         """
         from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-        db = get_supabase_client()
+        db = self.db
         users = await db.get_all_users_with_push_tokens()
         if not users:
             return
 
-        logger.info(f"[TaskNotifications] Checking {len(users)} users for daily task nudges")
+        logger.info("[TaskNotifications] Checking %s users for daily task nudges", len(users))
 
         for user in users:
             user_id = user.get("user_id")
@@ -236,9 +411,9 @@ class CallScheduler:
                         if ticket_id:
                             schedule_receipt_check(ticket_id, user_id)
 
-                logger.info(f"[TaskNotifications] Sent daily nudges for user {user_id}")
+                logger.info("[TaskNotifications] Sent daily nudges for user %s", user_id)
             except Exception as e:
-                logger.error(f"[TaskNotifications] Error processing user {user_id}: {e}")
+                logger.error("[TaskNotifications] Error processing user %s: %s", user_id, e)
 
     def _is_sprint_end_today(
         self, now_local: datetime, cadence: str, last_reset_str: Optional[str]
@@ -265,13 +440,19 @@ class CallScheduler:
             return
 
         self._notified_today: set[str] = set()
+        if self.db is None:
+            self.db = get_supabase_client()
         
-        # Add the job to run every 5 minutes
+        # Add the job to run every 5 minutes. A run that overruns the interval
+        # absorbs the next one instead of overlapping with it.
         self.scheduler.add_job(
             self.check_and_trigger_calls,
             trigger=IntervalTrigger(minutes=5),
             id="check_scheduled_calls",
             name="Check and trigger scheduled calls",
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=120,
             replace_existing=True
         )
 
@@ -396,7 +577,7 @@ class CallScheduler:
 
         self.scheduler.start()
         self._running = True
-        logger.info("Call scheduler started (checking every 5 minutes)")
+        logger.info("Call scheduler started (checking every 5 minutes and at each call's due time)")
 
     async def _run_action_dispatcher(self):
         """Poll the integration_actions queue and dispatch any due actions."""
@@ -405,7 +586,7 @@ class CallScheduler:
             await notify_pending_approvals()
             await run_due_actions()
         except Exception as e:
-            logger.error(f"[Scheduler] Action dispatcher poll failed: {e}", exc_info=True)
+            logger.error("[Scheduler] Action dispatcher poll failed: %s", e, exc_info=True)
 
     async def _run_integration_ingest(self):
         """Enrich newly synced integration_context rows with content + embeddings."""
@@ -413,7 +594,7 @@ class CallScheduler:
             from services.integration_ingest import enrich_integration_context
             await enrich_integration_context()
         except Exception as e:
-            logger.error(f"[Scheduler] Integration ingest failed: {e}", exc_info=True)
+            logger.error("[Scheduler] Integration ingest failed: %s", e, exc_info=True)
 
     async def _run_daily_briefing(self):
         """Generate per-user daily briefs at their local BRIEFING_HOUR."""
@@ -421,7 +602,7 @@ class CallScheduler:
             from services.briefing import run_daily_briefing
             await run_daily_briefing()
         except Exception as e:
-            logger.error(f"[Scheduler] Daily briefing failed: {e}", exc_info=True)
+            logger.error("[Scheduler] Daily briefing failed: %s", e, exc_info=True)
 
     async def _run_initiative_loop(self):
         """Scan attention emails and queue confirm-only reply drafts."""
@@ -429,7 +610,7 @@ class CallScheduler:
             from services.initiative_loop import run_initiative_loop
             await run_initiative_loop()
         except Exception as e:
-            logger.error(f"[Scheduler] Initiative loop failed: {e}", exc_info=True)
+            logger.error("[Scheduler] Initiative loop failed: %s", e, exc_info=True)
 
     async def _run_relationship_linker(self):
         """Refresh VIP status and link contacts to Notion/Slack identities."""
@@ -437,7 +618,7 @@ class CallScheduler:
             from services.relationship_linker import run_relationship_linker
             await run_relationship_linker()
         except Exception as e:
-            logger.error(f"[Scheduler] Relationship linker failed: {e}", exc_info=True)
+            logger.error("[Scheduler] Relationship linker failed: %s", e, exc_info=True)
 
     async def _run_follow_up_detector(self):
         """Run daily follow-up detection: unanswered threads + due-soon tasks."""
@@ -445,7 +626,7 @@ class CallScheduler:
             from services.follow_up_detector import run_follow_up_detector
             await run_follow_up_detector()
         except Exception as e:
-            logger.error(f"[Scheduler] Follow-up detector failed: {e}", exc_info=True)
+            logger.error("[Scheduler] Follow-up detector failed: %s", e, exc_info=True)
 
     async def _run_memory_consolidation(self):
         """Run nightly memory consolidation for all users."""
@@ -455,7 +636,7 @@ class CallScheduler:
             await consolidate_all_users_memories()
             logger.info("[Scheduler] Nightly memory consolidation complete")
         except Exception as e:
-            logger.error(f"[Scheduler] Memory consolidation failed: {e}", exc_info=True)
+            logger.error("[Scheduler] Memory consolidation failed: %s", e, exc_info=True)
 
     async def _run_skill_proposals(self):
         """Run nightly agent skill proposals for all users."""
@@ -465,7 +646,7 @@ class CallScheduler:
             await propose_skills_for_all_users()
             logger.info("[Scheduler] Nightly skill proposals complete")
         except Exception as e:
-            logger.error(f"[Scheduler] Skill proposals failed: {e}", exc_info=True)
+            logger.error("[Scheduler] Skill proposals failed: %s", e, exc_info=True)
 
     async def _run_skill_consolidation(self):
         """Run nightly agent skill consolidation/deduplication for all users."""
@@ -475,7 +656,7 @@ class CallScheduler:
             await consolidate_skills_for_all_users()
             logger.info("[Scheduler] Nightly skill consolidation complete")
         except Exception as e:
-            logger.error(f"[Scheduler] Skill consolidation failed: {e}", exc_info=True)
+            logger.error("[Scheduler] Skill consolidation failed: %s", e, exc_info=True)
 
     async def _run_background_agent(self):
         """Run a proactive reasoning pass for all active users."""
@@ -483,7 +664,7 @@ class CallScheduler:
             from services.background_agent import run_reasoning_pass_all_users
             await run_reasoning_pass_all_users()
         except Exception as e:
-            logger.error(f"[Scheduler] Background agent failed: {e}", exc_info=True)
+            logger.error("[Scheduler] Background agent failed: %s", e, exc_info=True)
 
     async def _run_autonomy_learner(self):
         """Daily scan of action_approval_log to propose user_autonomy_rules."""
@@ -493,14 +674,13 @@ class CallScheduler:
             await learn_autonomy_patterns_all_users()
             logger.info("[Scheduler] Autonomy learning complete")
         except Exception as e:
-            logger.error(f"[Scheduler] Autonomy learner failed: {e}", exc_info=True)
+            logger.error("[Scheduler] Autonomy learner failed: %s", e, exc_info=True)
 
     async def _run_world_state_refresh(self):
         """Refresh world state snapshots for all users (safety-net pass)."""
         try:
-            from services.supabase_client import get_supabase_client
             from services.world_state import refresh_world_state
-            db = get_supabase_client()
+            db = self.db
             resp = await asyncio.to_thread(
                 lambda: db.client.table("users").select("id").eq("ai_enabled", True).execute()
             )
@@ -510,9 +690,9 @@ class CallScheduler:
                     await refresh_world_state(uid)
                 except Exception:
                     pass
-            logger.debug(f"[Scheduler] World state refreshed for {len(user_ids)} users")
+            logger.debug("[Scheduler] World state refreshed for %s users", len(user_ids))
         except Exception as e:
-            logger.error(f"[Scheduler] World state refresh failed: {e}", exc_info=True)
+            logger.error("[Scheduler] World state refresh failed: %s", e, exc_info=True)
 
     def stop(self):
         """Stop the background scheduler."""
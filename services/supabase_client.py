@@ -1,9 +1,12 @@
 """Supabase database client for all database operations."""
 
+import asyncio
 import os
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 from uuid import UUID
+from zoneinfo import ZoneInfo
 import logging
 
 from supabase import create_client, Client
@@ -11,6 +14,36 @@ from supabase import create_client, Client
 logger = logging.getLogger(__name__)
 
 
+# Failed scheduled calls are retried after base * 2^(attempts - 1) seconds,
+# capped; enforced in the due-calls query so the page limit only counts
+# calls that are actually ready
+SCHEDULED_CALL_RETRY_BACKOFF_BASE_SECONDS = 300
+SCHEDULED_CALL_RETRY_BACKOFF_MAX_SECONDS = 3600
+
+
+def _retry_backoff_filter(now: datetime) -> str:
+    """PostgREST or= filter matching calls that have waited out their retry backoff."""
+    branches = ["last_attempt_at.is.null"]
+    attempts = 1
+    delay = SCHEDULED_CALL_RETRY_BACKOFF_BASE_SECONDS
+    while delay < SCHEDULED_CALL_RETRY_BACKOFF_MAX_SECONDS:
+        ready_before = (now - timedelta(seconds=delay)).isoformat()
+        # A missing attempt_count counts as a first attempt
+        count_filter = "or(attempt_count.is.null,attempt_count.lte.1)" if attempts == 1 else f"attempt_count.eq.{attempts}"
+        branches.append(f"and({count_filter},last_attempt_at.lte.{ready_before})")
+        attempts += 1
+        delay *= 2
+    ready_before = (now - timedelta(seconds=SCHEDULED_CALL_RETRY_BACKOFF_MAX_SECONDS)).isoformat()
+    branches.append(f"and(attempt_count.gte.{attempts},last_attempt_at.lte.{ready_before})")
+    return ",".join(branches)
+
+
+@lru_cache(maxsize=256)
+def _get_zoneinfo(name: str) -> ZoneInfo:
+    """Cached ZoneInfo lookup; zoneinfo's own strong cache only keeps 8 zones."""
+    return ZoneInfo(name)
+
+
 class SupabaseClient:
     """Client for interacting with Supabase database."""
 
@@ -32,7 +65,9 @@ class SupabaseClient:
     async def is_ai_enabled(self, user_id: str) -> bool:
         """Return False if the user's ai_enabled flag has been turned off by an admin."""
         try:
-            response = self.client.table("users").select("ai_enabled").eq("id", user_id).maybe_single().execute()
+            response = await asyncio.to_thread(
+                self.client.table("users").select("ai_enabled").eq("id", user_id).maybe_single().execute
+            )
             if response and response.data:
                 return response.data.get("ai_enabled", True)
             return True
@@ -85,7 +120,9 @@ class SupabaseClient:
         """
         try:
             # Query by the 'user_id' column (the FK to the user)
-            settings_response = self.client.table("user_settings").select("*").eq("user_id", user_id).execute()
+            settings_response = await asyncio.to_thread(
+                self.client.table("user_settings").select("*").eq("user_id", user_id).execute
+            )
             
             if not settings_response.data or len(settings_response.data) == 0:
                 logger.warning(f"User settings not found for: {user_id}")
@@ -106,6 +143,30 @@ class SupabaseClient:
             logger.error(f"Error fetching user settings: {e}")
             return None  # Return None instead of raising, so endpoint can handle gracefully
 
+    async def get_nylas_grant_ids(self, user_id: str) -> dict[str, str]:
+        """
+        Fetch the user's Nylas grant IDs keyed by integration type.
+        
+        Returns:
+            Dict like {"calendar": grant_id, "email": grant_id}; empty if none
+        """
+        try:
+            response = await asyncio.to_thread(
+                self.client.table("nylas_oauth_tokens").select("grant_id,integration_type").eq(
+                    "user_id", user_id
+                ).execute
+            )
+        except Exception as e:
+            logger.warning(f"Error fetching Nylas grant IDs: {e}")
+            return {}
+        
+        grants: dict[str, str] = {}
+        for token in (response.data or []):
+            integration_type = token.get("integration_type")
+            if integration_type and token.get("grant_id"):
+                grants.setdefault(integration_type, token["grant_id"])
+        return grants
+
     async def get_users_due_for_call(self) -> list[dict]:
         """
         Get all users who are due for a scheduled call.
@@ -115,33 +176,43 @@ class SupabaseClient:
         """
         try:
             # Use timezone-aware datetime for PostgREST comparison
-            from datetime import timezone
             now = datetime.now(timezone.utc).isoformat()
             
             # Query scheduled_calls only (no JOIN needed)
-            response = self.client.table("scheduled_calls").select(
-                "*"
-            ).eq("status", "pending").lte("scheduled_for", now).execute()
-            
-            # For each scheduled call, fetch the user settings separately
-            scheduled_calls = response.data or []
-            for call in scheduled_calls:
-                if call.get("user_id"):
-                    try:
-                        settings_response = self.client.table("user_settings").select(
-                            "*"
-                        ).eq("user_id", call["user_id"]).execute()
-                        if settings_response.data:
-                            call["user_settings"] = settings_response.data[0]
-                    except Exception as e:
-                        logger.warning(f"Could not fetch user_settings for scheduled call {call['id']}: {e}")
-                        call["user_settings"] = {}
+            response = await asyncio.to_thread(
+                self.client.table("scheduled_calls").select(
+                    "*"
+                ).eq("status", "pending").lte("scheduled_for", now).execute
+            )
             
-            return scheduled_calls
+            return await self._attach_user_settings(response.data or [])
         except Exception as e:
             logger.error(f"Error fetching users due for call: {e}")
             raise
 
+    async def _attach_user_settings(self, scheduled_calls: list[dict]) -> list[dict]:
+        """
+        Attach each scheduled call's user_settings row under "user_settings".
+        
+        scheduled_calls has no embeddable relationship to user_settings, so
+        the settings for every user in the batch are fetched with one query.
+        Calls whose user has no settings row get an empty dict.
+        """
+        user_ids = list({call["user_id"] for call in scheduled_calls if call.get("user_id")})
+        if not user_ids:
+            return scheduled_calls
+
+        settings_response = await asyncio.to_thread(
+            self.client.table("user_settings").select(
+                "*"
+            ).in_("user_id", user_ids).execute
+        )
+        settings_by_user = {row["user_id"]: row for row in settings_response.data or []}
+        for call in scheduled_calls:
+            if call.get("user_id"):
+                call["user_settings"] = settings_by_user.get(call["user_id"], {})
+        return scheduled_calls
+
     # ==================== Buckets & Tasks ====================
 
     async def get_user_buckets_with_loops(self, user_id: str) -> list[dict]:
@@ -164,6 +235,18 @@ class SupabaseClient:
             logger.error(f"Error fetching buckets with loops: {e}")
             raise
 
+    @staticmethod
+    def _flatten_buckets(tasks: list[dict]) -> list[dict]:
+        """Replace each task's embedded buckets(...) row with bucket_name/bucket_color keys."""
+        for task in tasks:
+            bucket = task.get("buckets")
+            if bucket:
+                task["bucket_name"] = bucket["name"]
+                if "color" in bucket:
+                    task["bucket_color"] = bucket["color"]
+                del task["buckets"]
+        return tasks
+
     async def get_this_week_tasks(self, user_id: str) -> list[dict]:
         """
         Get tasks marked for this week's focus.
@@ -179,16 +262,7 @@ class SupabaseClient:
                 "*, buckets(name, color)"
             ).eq("user_id", user_id).eq("is_this_week", True).neq("status", "done").execute()
             
-            # Flatten bucket info
-            tasks = []
-            for task in response.data or []:
-                if task.get("buckets"):
-                    task["bucket_name"] = task["buckets"]["name"]
-                    task["bucket_color"] = task["buckets"]["color"]
-                    del task["buckets"]
-                tasks.append(task)
-            
-            return tasks
+            return self._flatten_buckets(response.data or [])
         except Exception as e:
             logger.error(f"Error fetching this week's tasks: {e}")
             raise
@@ -210,16 +284,7 @@ class SupabaseClient:
                 "*, buckets(name, color)"
             ).eq("user_id", user_id).neq("status", "done").lt("due_date", now).execute()
             
-            # Flatten bucket info
-            tasks = []
-            for task in response.data or []:
-                if task.get("buckets"):
-                    task["bucket_name"] = task["buckets"]["name"]
-                    task["bucket_color"] = task["buckets"]["color"]
-                    del task["buckets"]
-                tasks.append(task)
-            
-            return tasks
+            return self._flatten_buckets(response.data or [])
         except Exception as e:
             logger.error(f"Error fetching overdue tasks: {e}")
             raise
@@ -231,13 +296,7 @@ class SupabaseClient:
                 "*, buckets(name, color)"
             ).eq("user_id", user_id).eq("is_this_week", False).neq("status", "done").neq("view_tab", "completed").execute()
 
-            tasks = []
-            for task in response.data or []:
-                if task.get("buckets"):
-                    task["bucket_name"] = task["buckets"]["name"]
-                    task["bucket_color"] = task["buckets"]["color"]
-                    del task["buckets"]
-                tasks.append(task)
+            tasks = self._flatten_buckets(response.data or [])
 
             priority_order = {"high": 0, "medium": 1, "low": 2}
             tasks.sort(key=lambda t: priority_order.get(t.get("priority", "medium"), 1))
@@ -249,8 +308,7 @@ class SupabaseClient:
     async def get_tasks_due_today(self, user_id: str, timezone: str = "UTC") -> list[dict]:
         """Get tasks with a due date of today in the user's local timezone."""
         try:
-            from zoneinfo import ZoneInfo
-            user_tz = ZoneInfo(timezone)
+            user_tz = _get_zoneinfo(timezone)
             today_local = datetime.now(user_tz).date()
             today_start = f"{today_local.isoformat()}T00:00:00"
             today_end = f"{today_local.isoformat()}T23:59:59"
@@ -259,13 +317,7 @@ class SupabaseClient:
                 "*, buckets(name)"
             ).eq("user_id", user_id).neq("status", "done").gte("due_date", today_start).lte("due_date", today_end).execute()
 
-            tasks = []
-            for task in response.data or []:
-                if task.get("buckets"):
-                    task["bucket_name"] = task["buckets"]["name"]
-                    del task["buckets"]
-                tasks.append(task)
-            return tasks
+            return self._flatten_buckets(response.data or [])
         except Exception as e:
             logger.error(f"Error fetching tasks due today for user {user_id}: {e}")
             return []
@@ -299,16 +351,7 @@ class SupabaseClient:
                 "*, buckets(name, color)"
             ).eq("user_id", user_id).eq("status", "done").gte("updated_at", since).execute()
             
-            # Flatten bucket info
-            tasks = []
-            for task in response.data or []:
-                if task.get("buckets"):
-                    task["bucket_name"] = task["buckets"]["name"]
-                    task["bucket_color"] = task["buckets"]["color"]
-                    del task["buckets"]
-                tasks.append(task)
-            
-            return tasks
+            return self._flatten_buckets(response.data or [])
         except Exception as e:
             logger.error(f"Error fetching recently completed tasks: {e}")
             raise
@@ -679,7 +722,8 @@ class SupabaseClient:
         user_id: str,
         phone_number: str,
         livekit_room_name: str,
-        scheduled_at: Optional[str] = None
+        scheduled_at: Optional[str] = None,
+        call_log_id: Optional[str] = None,
     ) -> dict:
         """
         Create a new call log entry.
@@ -689,6 +733,7 @@ class SupabaseClient:
             phone_number: The phone number being called
             livekit_room_name: The LiveKit room name for this call
             scheduled_at: When the call was scheduled for
+            call_log_id: Optional pre-generated UUID for the row
             
         Returns:
             Created call log data
@@ -705,8 +750,12 @@ class SupabaseClient:
             
             if scheduled_at:
                 call_data["scheduled_at"] = scheduled_at
+            if call_log_id:
+                call_data["id"] = call_log_id
             
-            response = self.client.table("call_logs").insert(call_data).execute()
+            response = await asyncio.to_thread(
+                self.client.table("call_logs").insert(call_data).execute
+            )
             
             logger.info(f"Created call log for user {user_id}")
             return response.data[0] if response.data else {}
@@ -714,6 +763,53 @@ class SupabaseClient:
             logger.error(f"Error creating call log: {e}")
             raise
 
+    async def record_failed_call_log(
+        self,
+        call_log_id: str,
+        user_id: str,
+        phone_number: str,
+        livekit_room_name: str,
+        failure_reason: str,
+    ) -> dict:
+        """
+        Insert a failed call log for a trigger that gave up before its row
+        was created.
+        
+        Used when the call_log_id was already handed out to a client, so the
+        id always resolves to a row. Rows that already exist are updated with
+        update_call_log instead.
+        
+        Args:
+            call_log_id: The pre-generated UUID of the call log
+            user_id: The UUID of the user
+            phone_number: The phone number that would have been called
+            livekit_room_name: The LiveKit room name reserved for the call
+            failure_reason: Why the call was not placed
+            
+        Returns:
+            The failed call log data
+        """
+        try:
+            now_iso = datetime.now(timezone.utc).isoformat()
+            response = await asyncio.to_thread(
+                self.client.table("call_logs").insert({
+                    "id": call_log_id,
+                    "user_id": user_id,
+                    "phone_number": phone_number,
+                    "livekit_room_name": livekit_room_name,
+                    "status": "failed",
+                    "failure_reason": failure_reason,
+                    "created_at": now_iso,
+                    "updated_at": now_iso,
+                }).execute
+            )
+            
+            logger.info(f"Recorded failed call log {call_log_id} for user {user_id}")
+            return response.data[0] if response.data else {}
+        except Exception as e:
+            logger.error(f"Error recording failed call log: {e}")
+            raise
+
     async def update_call_log(self, call_log_id: str, updates: dict) -> dict:
         """
         Update a call log entry.
@@ -728,7 +824,9 @@ class SupabaseClient:
         try:
             updates["updated_at"] = datetime.now(timezone.utc).isoformat()
             
-            response = self.client.table("call_logs").update(updates).eq("id", call_log_id).execute()
+            response = await asyncio.to_thread(
+                self.client.table("call_logs").update(updates).eq("id", call_log_id).execute
+            )
             
             logger.info(f"Updated call log {call_log_id}")
             return response.data[0] if response.data else {}
@@ -770,12 +868,79 @@ class SupabaseClient:
             logger.error(f"Error fetching call log by SID: {e}")
             return None
 
+    async def get_call_logs_by_sids(self, call_sids: list[str]) -> dict[str, dict]:
+        """
+        Get call logs for several Twilio call SIDs in one query.
+        
+        Args:
+            call_sids: The Twilio call SIDs to look up
+            
+        Returns:
+            Dict mapping call SID to its call log (id, call_sid, user_id)
+        """
+        if not call_sids:
+            return {}
+        try:
+            response = await asyncio.to_thread(
+                self.client.table("call_logs").select(
+                    "id, call_sid, user_id"
+                ).in_("call_sid", call_sids).execute
+            )
+            return {row["call_sid"]: row for row in response.data or []}
+        except Exception as e:
+            logger.error(f"Error fetching call logs by SID: {e}")
+            return {}
+
+    def _insert_scheduled_calls(self, user_id: str, rows: list[dict]) -> list[dict]:
+        """
+        Insert scheduled call rows in one request.
+        
+        If any slot already has an active call (unique violation), the whole
+        batch is rejected, so fall back to inserting row by row and skip the
+        duplicates.
+        
+        Returns:
+            The inserted rows
+        """
+        if not rows:
+            return []
+
+        def is_duplicate(err: Exception) -> bool:
+            err_str = str(err).lower()
+            return "duplicate" in err_str or "unique" in err_str or "23505" in err_str
+
+        try:
+            response = self.client.table("scheduled_calls").insert(rows).execute()
+            created_calls = response.data or []
+            logger.info(f"Created {len(created_calls)} scheduled calls for user {user_id}")
+            return created_calls
+        except Exception as batch_err:
+            if not is_duplicate(batch_err):
+                logger.error(f"Error inserting scheduled calls for user {user_id}: {batch_err}")
+                raise
+
+        created_calls = []
+        for row in rows:
+            try:
+                response = self.client.table("scheduled_calls").insert(row).execute()
+                if response.data:
+                    created_calls.append(response.data[0])
+                    logger.info(f"Created scheduled call for user {user_id} at {row['scheduled_for']} UTC")
+            except Exception as slot_err:
+                if is_duplicate(slot_err):
+                    logger.info(f"Active scheduled call already exists for user {user_id} at {row['scheduled_for']}, skipping")
+                else:
+                    logger.error(f"Error inserting scheduled call for user {user_id} at {row['scheduled_for']}: {slot_err}")
+                    raise
+        return created_calls
+
     async def create_all_scheduled_calls(
         self,
         user_id: str,
         checkin_schedule: list,
         timezone: str,
-        checkin_enabled: bool = True
+        checkin_enabled: bool = True,
+        existing_slots: Optional[set[str]] = None
     ) -> list[dict]:
         """
         Create all upcoming scheduled calls based on the checkin_schedule.
@@ -786,6 +951,8 @@ class SupabaseClient:
             checkin_schedule: List of schedule entries [{"day": 1, "time": "09:40", "label": "Monday"}, ...]
             timezone: The user's timezone
             checkin_enabled: Whether checkins are enabled
+            existing_slots: UTC ISO times that already have a pending call; these
+                slots are skipped instead of attempting a duplicate insert
             
         Returns:
             List of created scheduled calls
@@ -795,15 +962,16 @@ class SupabaseClient:
             return []
         
         try:
-            from zoneinfo import ZoneInfo
-            
             # Get current time in user's timezone
-            user_tz = ZoneInfo(timezone)
+            user_tz = _get_zoneinfo(timezone)
             now_local = datetime.now(user_tz)
+            now_utc_iso = datetime.now(_get_zoneinfo("UTC")).isoformat()
             
-            created_calls = []
+            # Rows to insert, keyed by slot so entries landing on the same
+            # UTC time collapse into one row instead of a duplicate insert
+            rows_by_slot: dict[str, dict] = {}
             
-            # Create a scheduled call for each entry
+            # Build a scheduled call for each entry
             for schedule_entry in checkin_schedule:
                 day = schedule_entry.get("day")
                 time_str = schedule_entry.get("time")
@@ -835,7 +1003,12 @@ class SupabaseClient:
                     next_call_local += timedelta(days=7)
                 
                 # Convert to UTC
-                next_call_utc = next_call_local.astimezone(ZoneInfo("UTC"))
+                next_call_utc = next_call_local.astimezone(_get_zoneinfo("UTC"))
+                slot = next_call_utc.isoformat()
+                
+                if existing_slots and slot in existing_slots:
+                    logger.info(f"Pending scheduled call already exists for {label} at {time_str}, skipping")
+                    continue
                 
                 # Determine time window
                 if hour < 12:
@@ -845,32 +1018,18 @@ class SupabaseClient:
                 else:
                     time_window = "evening"
                 
-                # Create scheduled call
-                scheduled_call_data = {
+                rows_by_slot.setdefault(slot, {
                     "user_id": user_id,
-                    "scheduled_for": next_call_utc.isoformat(),
+                    "scheduled_for": slot,
                     "time_window": time_window,
                     "status": "pending",
                     "attempt_count": 0,
                     "max_attempts": 3,
-                    "created_at": datetime.now(ZoneInfo("UTC")).isoformat(),
-                    "updated_at": datetime.now(ZoneInfo("UTC")).isoformat()
-                }
-                
-                try:
-                    response = self.client.table("scheduled_calls").insert(scheduled_call_data).execute()
-                    if response.data:
-                        created_calls.append(response.data[0])
-                        logger.info(f"Created scheduled call for {label} at {time_str} -> {next_call_utc.isoformat()} UTC")
-                    else:
-                        logger.info(f"No data returned for {label} insert (may already exist), skipping")
-                except Exception as slot_err:
-                    err_str = str(slot_err).lower()
-                    if "duplicate" in err_str or "unique" in err_str or "23505" in err_str:
-                        logger.info(f"Active scheduled call already exists for user {user_id} at {next_call_utc.isoformat()}, skipping")
-                    else:
-                        logger.error(f"Error inserting scheduled call for {label}: {slot_err}")
-                        raise
+                    "created_at": now_utc_iso,
+                    "updated_at": now_utc_iso
+                })
+            
+            created_calls = self._insert_scheduled_calls(user_id, list(rows_by_slot.values()))
             
             # Update user_settings with the earliest next scheduled call
             if created_calls:
@@ -878,7 +1037,7 @@ class SupabaseClient:
                 try:
                     self.client.table("user_settings").update({
                         "next_scheduled_call": earliest["scheduled_for"],
-                        "updated_at": datetime.now(ZoneInfo("UTC")).isoformat()
+                        "updated_at": datetime.now(_get_zoneinfo("UTC")).isoformat()
                     }).eq("user_id", user_id).execute()
                 except Exception as e:
                     logger.warning(f"Could not update user_settings.next_scheduled_call: {e}")
@@ -890,62 +1049,94 @@ class SupabaseClient:
 
     # ==================== Scheduled Calls ====================
 
-    async def get_pending_scheduled_calls(self) -> list[dict]:
+    async def get_pending_scheduled_calls(self, limit: Optional[int] = None) -> list[dict]:
         """
-        Get all pending scheduled calls that are due.
+        Get pending scheduled calls that are due, oldest first.
+
+        Calls that already failed are only returned once their retry backoff
+        has elapsed.
         
+        Args:
+            limit: Maximum number of calls to return (all if None)
+            
         Returns:
             List of scheduled calls that are ready to be processed
         """
         try:
-            from datetime import timezone, timedelta
             now = datetime.now(timezone.utc)
             now_iso = now.isoformat()
-            five_min_ago = (now - timedelta(minutes=5)).isoformat()
 
             logger.info(f"Querying scheduled_calls with now={now_iso}")
 
-            response = self.client.table("scheduled_calls").select(
+            query = self.client.table("scheduled_calls").select(
                 "*"
             ).eq("status", "pending").lte("scheduled_for", now_iso).or_(
-                f"last_attempt_at.is.null,last_attempt_at.lte.{five_min_ago}"
-            ).order("scheduled_for").execute()
+                _retry_backoff_filter(now)
+            ).order("scheduled_for")
+            if limit:
+                query = query.limit(limit)
+            response = await asyncio.to_thread(query.execute)
             
-            # For each scheduled call, fetch the user settings separately
             scheduled_calls = response.data or []
             logger.info(f"Found {len(scheduled_calls)} pending scheduled calls")
-            for call in scheduled_calls:
-                if call.get("user_id"):
-                    try:
-                        settings_response = self.client.table("user_settings").select(
-                            "*"
-                        ).eq("user_id", call["user_id"]).execute()
-                        if settings_response.data:
-                            call["user_settings"] = settings_response.data[0]
-                    except Exception as e:
-                        logger.warning(f"Could not fetch user_settings for scheduled call {call['id']}: {e}")
-                        call["user_settings"] = {}
-            
-            return scheduled_calls
+            # Let a settings failure abort the run rather than treat every
+            # user in the batch as unreachable and skip their calls
+            return await self._attach_user_settings(scheduled_calls)
         except Exception as e:
             logger.error(f"Error fetching pending scheduled calls: {e}")
             raise
 
-    async def update_scheduled_call(self, scheduled_call_id: str, updates: dict) -> dict:
+    async def get_next_pending_call_time(self) -> Optional[datetime]:
+        """
+        Get when the next not-yet-due pending scheduled call is due.
+        
+        Returns:
+            The earliest future scheduled_for among pending calls, or None
+        """
+        try:
+            now_iso = datetime.now(timezone.utc).isoformat()
+            response = await asyncio.to_thread(
+                self.client.table("scheduled_calls").select("scheduled_for").eq(
+                    "status", "pending"
+                ).gt("scheduled_for", now_iso).order("scheduled_for").limit(1).execute
+            )
+            if not response.data:
+                return None
+
+            scheduled_for = datetime.fromisoformat(
+                response.data[0]["scheduled_for"].replace(" ", "T").replace("Z", "+00:00")
+            )
+            if scheduled_for.tzinfo is None:
+                scheduled_for = scheduled_for.replace(tzinfo=timezone.utc)
+            return scheduled_for
+        except Exception as e:
+            logger.error(f"Error fetching next pending call time: {e}")
+            raise
+
+    async def update_scheduled_call(
+        self,
+        scheduled_call_id: str,
+        updates: dict,
+        expected_status: Optional[str] = None
+    ) -> dict:
         """
         Update a scheduled call entry.
         
         Args:
             scheduled_call_id: The UUID of the scheduled call
             updates: Dictionary of fields to update
+            expected_status: Only update if the row still has this status
             
         Returns:
-            Updated scheduled call data
+            Updated scheduled call data (empty if no row matched)
         """
         try:
             updates["updated_at"] = datetime.now(timezone.utc).isoformat()
             
-            response = self.client.table("scheduled_calls").update(updates).eq("id", scheduled_call_id).execute()
+            query = self.client.table("scheduled_calls").update(updates).eq("id", scheduled_call_id)
+            if expected_status:
+                query = query.eq("status", expected_status)
+            response = await asyncio.to_thread(query.execute)
             
             logger.info(f"Updated scheduled call {scheduled_call_id}")
             return response.data[0] if response.data else {}
@@ -953,6 +1144,66 @@ class SupabaseClient:
             logger.error(f"Error updating scheduled call: {e}")
             raise
 
+    async def skip_scheduled_calls(self, scheduled_call_ids: list[str]) -> int:
+        """
+        Mark several pending scheduled calls as skipped in one write.
+        
+        Args:
+            scheduled_call_ids: UUIDs of the scheduled calls to skip
+            
+        Returns:
+            Number of scheduled calls that were still pending and got skipped
+        """
+        if not scheduled_call_ids:
+            return 0
+        try:
+            now_iso = datetime.now(timezone.utc).isoformat()
+            response = await asyncio.to_thread(
+                self.client.table("scheduled_calls").update({
+                    "status": "skipped",
+                    "last_attempt_at": now_iso,
+                    "updated_at": now_iso,
+                }).in_("id", scheduled_call_ids).eq("status", "pending").execute
+            )
+            return len(response.data or [])
+        except Exception as e:
+            logger.error(f"Error skipping scheduled calls: {e}")
+            raise
+
+    async def set_scheduled_calls_status(
+        self,
+        scheduled_call_ids: list[str],
+        status: str,
+        last_attempt_at: Optional[str] = None,
+    ) -> int:
+        """
+        Set the status of several scheduled calls in one write.
+        
+        Args:
+            scheduled_call_ids: UUIDs of the scheduled calls to update
+            status: The new status
+            last_attempt_at: ISO timestamp to record as the last attempt (unchanged if None)
+            
+        Returns:
+            Number of scheduled calls updated
+        """
+        if not scheduled_call_ids:
+            return 0
+        update_data = {
+            "status": status,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if last_attempt_at:
+            update_data["last_attempt_at"] = last_attempt_at
+        try:
+            response = await asyncio.to_thread(
+                self.client.table("scheduled_calls").update(update_data).in_("id", scheduled_call_ids).execute
+            )
+            return len(response.data or [])
+        except Exception as e:
+            logger.error(f"Error updating scheduled call statuses: {e}")
+            raise
+
     async def mark_scheduled_call_complete(self, scheduled_call_id: str, call_log_id: str) -> dict:
         """
         Mark a scheduled call as completed.
@@ -1044,10 +1295,8 @@ class SupabaseClient:
             return None
         
         try:
-            from zoneinfo import ZoneInfo
-            
             # Get current time in user's timezone
-            user_tz = ZoneInfo(timezone)
+            user_tz = _get_zoneinfo(timezone)
             now_local = datetime.now(user_tz)
             
             # Find the next scheduled time
@@ -1097,7 +1346,7 @@ class SupabaseClient:
                 return None
             
             # Convert to UTC
-            next_call_utc = next_call_local.astimezone(ZoneInfo("UTC"))
+            next_call_utc = next_call_local.astimezone(_get_zoneinfo("UTC"))
             
             # Determine time window
             hour_local = next_call_local.hour
@@ -1142,11 +1391,10 @@ class SupabaseClient:
             return None
         
         try:
-            from zoneinfo import ZoneInfo
             from datetime import datetime as dt
             
             # Get current time in user's timezone
-            user_tz = ZoneInfo(timezone)
+            user_tz = _get_zoneinfo(timezone)
             now_local = datetime.now(user_tz)
             
             # Find the next scheduled time
@@ -1202,7 +1450,7 @@ class SupabaseClient:
                 return None
             
             # Convert to UTC for storage
-            next_call_utc = next_call_local.astimezone(ZoneInfo("UTC"))
+            next_call_utc = next_call_local.astimezone(_get_zoneinfo("UTC"))
             
             # Determine time window for backward compatibility
             hour_local = next_call_local.hour
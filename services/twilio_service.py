@@ -53,10 +53,10 @@ class SIPCallService:
                     metadata=f'{{"user_id": "{user_id}", "call_log_id": "{call_log_id}"}}'
                 )
             )
-            logger.info(f"Created LiveKit room: {room_name}")
+            logger.info("Created LiveKit room: %s", room_name)
             return True
         except Exception as e:
-            logger.error(f"Failed to create LiveKit room: {e}")
+            logger.error("Failed to create LiveKit room: %s", e)
             return False
 
     async def dial_phone(
@@ -95,11 +95,11 @@ class SIPCallService:
                 )
             )
             
-            logger.info(f"Initiated SIP call to {to_number} in room {room_name}")
+            logger.info("Initiated SIP call to %s in room %s", to_number, room_name)
             return response.participant_id if response else None
             
         except Exception as e:
-            logger.error(f"Failed to dial phone via SIP: {e}")
+            logger.error("Failed to dial phone via SIP: %s", e)
             raise
 
     async def close(self):
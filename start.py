@@ -23,7 +23,9 @@ def main():
         sys.executable, "-m", "uvicorn", 
         "main:app", 
         "--host", "0.0.0.0", 
-        "--port", port
+        "--port", port,
+        "--loop", "auto",  # uvloop when installed (not on Windows)
+        "--http", "httptools",
     ], env=env, cwd=app_dir)
     
     # Start LiveKit agent worker